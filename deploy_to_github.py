@@ -4,71 +4,116 @@ GitHub Deployment Script for AI Discussion Manager
 This script helps deploy the application to GitHub with proper setup.
 """
 
-import os
+import functools
 import subprocess
 import sys
-from pathlib import Path
-
-def run_command(command, description=""):
-    """Run a shell command and return success status"""
+from concurrent.futures import ThreadPoolExecutor
+
+from deploy_utils import find_present_files
+
+REQUIRED_FILES = [
+    'main.py',
+    'prompts.py',
+    'requirements.txt',
+    'README.md',
+    '.gitignore',
+    'setup_database.py',
+    'env_bootstrap.py',
+    'test_connection.py'
+]
+
+OPTIONAL_FILES = [
+    'CONTRIBUTING.md',
+    'LICENSE',
+    '.github/workflows/ci.yml',
+    'push_to_github.py',
+    'deploy_to_github.py',
+    'deploy_utils.py'
+]
+
+def run_command(cmd, description=""):
+    """Run a command given as an argv list and return success status"""
     print(f"🔧 {description}")
     try:
-        result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
+        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
         print(f"✅ {description} - Success")
         return True, result.stdout
     except subprocess.CalledProcessError as e:
         print(f"❌ {description} - Failed")
         print(f"Error: {e.stderr}")
         return False, e.stderr
+    except OSError as e:
+        print(f"❌ {description} - Failed")
+        print(f"Error: {e}")
+        return False, str(e)
+
+@functools.lru_cache(maxsize=1)
+def has_github_cli():
+    """Check once whether the GitHub CLI is installed"""
+    success, _ = run_command(["gh", "--version"], "Checking GitHub CLI installation")
+    return success
 
 def create_github_repo():
-    """Guide user through GitHub repository creation"""
+    """Guide user through GitHub repository creation
+
+    Returns a tuple of (repository created, GitHub CLI available).
+    """
     print("\n" + "="*60)
     print("🚀 GITHUB REPOSITORY DEPLOYMENT")
     print("="*60)
 
-    # Check if GitHub CLI is available
-    success, _ = run_command("gh --version", "Checking GitHub CLI installation")
-    if not success:
-        print("\n❌ GitHub CLI not found. Please install it first:")
-        print("   https://cli.github.com/")
-        print("\nAlternatively, create repository manually at: https://github.com/new")
-        return False
-
-    # Get repository details from user
-    repo_name = input("\n📝 Enter repository name (ai-discussion-manager): ").strip()
-    if not repo_name:
-        repo_name = "ai-discussion-manager"
-
-    repo_description = "🤖 AI-powered collaborative development tool for multi-disciplinary project analysis and planning"
-
-    visibility = input("🔒 Repository visibility (public/private) [public]: ").strip().lower()
-    if visibility not in ['private', 'public']:
-        visibility = 'public'
-
-    # Create GitHub repository
-    print(f"\n📦 Creating GitHub repository: {repo_name}")
-    cmd = f'gh repo create {repo_name} --description "{repo_description}" --{visibility} --source=. --remote=origin --push'
-    success, output = run_command(cmd, "Creating GitHub repository")
-
-    if success:
-        print(f"\n🎉 Repository created successfully!")
-        print(f"🌐 Repository URL: https://github.com/{get_github_username()}/{repo_name}")
-        return True
-    else:
-        print("\n❌ Failed to create repository automatically.")
-        print("Please create it manually at: https://github.com/new")
-        print(f"Then run: git remote add origin https://github.com/YOUR_USERNAME/{repo_name}.git")
-        print("         git push -u origin master")
-        return False
-
+    # Look up the username in the background while the CLI check and prompts run
+    executor = ThreadPoolExecutor(max_workers=1)
+    username_future = executor.submit(get_github_username)
+    try:
+        # Check if GitHub CLI is available
+        if not has_github_cli():
+            print("\n❌ GitHub CLI not found. Please install it first:")
+            print("   https://cli.github.com/")
+            print("\nAlternatively, create repository manually at: https://github.com/new")
+            return False, False
+
+        # Get repository details from user
+        repo_name = input("\n📝 Enter repository name (ai-discussion-manager): ").strip()
+        if not repo_name:
+            repo_name = "ai-discussion-manager"
+
+        repo_description = "🤖 AI-powered collaborative development tool for multi-disciplinary project analysis and planning"
+
+        visibility = input("🔒 Repository visibility (public/private) [public]: ").strip().lower()
+        if visibility not in ['private', 'public']:
+            visibility = 'public'
+
+        # Create GitHub repository
+        print(f"\n📦 Creating GitHub repository: {repo_name}")
+        cmd = [
+            "gh", "repo", "create", repo_name,
+            "--description", repo_description,
+            f"--{visibility}", "--source=.", "--remote=origin", "--push"
+        ]
+        success, output = run_command(cmd, "Creating GitHub repository")
+
+        if success:
+            print(f"\n🎉 Repository created successfully!")
+            print(f"🌐 Repository URL: https://github.com/{username_future.result()}/{repo_name}")
+            return True, True
+        else:
+            print("\n❌ Failed to create repository automatically.")
+            print("Please create it manually at: https://github.com/new")
+            print(f"Then run: git remote add origin https://github.com/YOUR_USERNAME/{repo_name}.git")
+            print("         git push -u origin master")
+            return False, True
+    finally:
+        executor.shutdown(wait=False)
+
+@functools.lru_cache(maxsize=1)
 def get_github_username():
     """Get GitHub username from gh CLI"""
     try:
-        result = subprocess.run("gh api user -q .login", shell=True, capture_output=True, text=True, check=True)
-        return result.stdout.strip()
-    except:
+        result = subprocess.run(["gh", "api", "user", "-q", ".login"], capture_output=True, text=True, check=False)
+    except OSError:
         return "YOUR_USERNAME"
+    return result.stdout.strip() if result.returncode == 0 else "YOUR_USERNAME"
 
 def push_to_github():
     """Push code to existing GitHub repository"""
@@ -77,7 +122,7 @@ def push_to_github():
     print("="*60)
 
     # Check for existing remote
-    success, remotes = run_command("git remote -v", "Checking existing remotes")
+    success, remotes = run_command(["git", "remote", "-v"], "Checking existing remotes")
     if "origin" in remotes:
         print("✅ Remote 'origin' already exists")
     else:
@@ -87,67 +132,53 @@ def push_to_github():
             print("❌ Repository URL is required")
             return False
 
-        success, _ = run_command(f"git remote add origin {repo_url}", "Adding remote origin")
+        success, _ = run_command(["git", "remote", "add", "origin", repo_url], "Adding remote origin")
         if not success:
             return False
 
     # Push to GitHub
-    success, _ = run_command("git push -u origin master", "Pushing code to GitHub")
+    success, _ = run_command(["git", "push", "-u", "origin", "master"], "Pushing code to GitHub")
     if success:
         print("\n🎉 Code successfully pushed to GitHub!")
         return True
     else:
         return False
 
-def setup_deployment_files():
-    """Ensure all deployment files are present"""
-    print("\n" + "="*60)
-    print("📋 DEPLOYMENT FILE CHECK")
-    print("="*60)
+def setup_deployment_files(present):
+    """Report which deployment files are present"""
+    lines = ["", "="*60, "📋 DEPLOYMENT FILE CHECK", "="*60]
 
-    required_files = [
-        'main.py',
-        'requirements.txt',
-        'README.md',
-        '.gitignore',
-        'setup_database.py',
-        'test_connection.py'
-    ]
-
-    optional_files = [
-        'CONTRIBUTING.md',
-        'LICENSE',
-        '.github/workflows/ci.yml',
-        'push_to_github.py',
-        'deploy_to_github.py'
-    ]
-
-    print("Required files:")
-    for file in required_files:
-        if Path(file).exists():
-            print(f"✅ {file}")
+    lines.append("Required files:")
+    for file in REQUIRED_FILES:
+        if file in present:
+            lines.append(f"✅ {file}")
         else:
-            print(f"❌ {file} - MISSING!")
+            lines.append(f"❌ {file} - MISSING!")
 
-    print("\nOptional files:")
-    for file in optional_files:
-        if Path(file).exists():
-            print(f"✅ {file}")
+    lines.append("\nOptional files:")
+    for file in OPTIONAL_FILES:
+        if file in present:
+            lines.append(f"✅ {file}")
         else:
-            print(f"⚠️  {file} - Not found")
+            lines.append(f"⚠️  {file} - Not found")
+
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
 
 def main():
     """Main deployment function"""
     print("🤖 AI Discussion Manager - GitHub Deployment")
     print("==========================================")
 
+    files_present = find_present_files(REQUIRED_FILES + OPTIONAL_FILES)
+
     # Check if we're in the right directory
-    if not Path('main.py').exists():
+    if 'main.py' not in files_present:
         print("❌ Error: main.py not found. Please run this script from the project root directory.")
         sys.exit(1)
 
     # Setup deployment files check
-    setup_deployment_files()
+    setup_deployment_files(files_present)
 
     # Choose deployment method
     print("\n" + "="*60)
@@ -158,9 +189,11 @@ def main():
     print("3. ❓ Help with manual setup")
 
     choice = input("\nChoose option (1-3): ").strip()
+    gh_available = True
 
     if choice == '1':
-        if create_github_repo():
+        created, gh_available = create_github_repo()
+        if created:
             print("\n✅ Deployment completed successfully!")
         else:
             print("\n❌ Deployment failed. Please try manual setup.")
@@ -175,39 +208,44 @@ def main():
         print("❌ Invalid choice. Please run the script again.")
 
     # If GitHub CLI is not available, automatically show manual help
-    if choice == '1' and not success:
+    if choice == '1' and not gh_available:
         print("\n" + "="*60)
         print("📖 AUTOMATIC MANUAL SETUP (Since GitHub CLI is not available)")
         print("="*60)
         show_manual_setup_help()
 
-def show_manual_setup_help():
-    """Show manual setup instructions"""
-    print("\n" + "="*60)
-    print("📖 MANUAL GITHUB SETUP INSTRUCTIONS")
-    print("="*60)
+MANUAL_SETUP_HELP = """
+============================================================
+📖 MANUAL GITHUB SETUP INSTRUCTIONS
+============================================================
 
-    print("\n1. 🌐 Go to GitHub.com and create a new repository:")
-    print("   - Click the '+' icon → 'New repository'")
-    print("   - Repository name: ai-discussion-manager")
-    print("   - Description: AI-powered collaborative development tool")
-    print("   - Make it Public or Private")
-    print("   - DON'T initialize with README, .gitignore, or license")
+1. 🌐 Go to GitHub.com and create a new repository:
+   - Click the '+' icon → 'New repository'
+   - Repository name: ai-discussion-manager
+   - Description: AI-powered collaborative development tool
+   - Make it Public or Private
+   - DON'T initialize with README, .gitignore, or license
 
-    print("\n2. 🔗 Copy the repository URL from GitHub")
+2. 🔗 Copy the repository URL from GitHub
 
-    print("\n3. 🖥️  Run these commands in your terminal:")
-    print("   git remote add origin https://github.com/YOUR_USERNAME/ai-discussion-manager.git")
-    print("   git push -u origin master")
+3. 🖥️  Run these commands in your terminal:
+   git remote add origin https://github.com/YOUR_USERNAME/ai-discussion-manager.git
+   git push -u origin master
 
-    print("\n4. 🎯 After successful push, your repository will be live at:")
-    print("   https://github.com/YOUR_USERNAME/ai-discussion-manager")
+4. 🎯 After successful push, your repository will be live at:
+   https://github.com/YOUR_USERNAME/ai-discussion-manager
 
-    print("\n5. 📚 Additional setup (optional):")
-    print("   - Add repository topics: ai, machine-learning, development-tools")
-    print("   - Enable GitHub Pages for documentation")
-    print("   - Set up branch protection rules")
-    print("   - Configure repository settings")
+5. 📚 Additional setup (optional):
+   - Add repository topics: ai, machine-learning, development-tools
+   - Enable GitHub Pages for documentation
+   - Set up branch protection rules
+   - Configure repository settings
+"""
+
+def show_manual_setup_help():
+    """Show manual setup instructions"""
+    sys.stdout.write(MANUAL_SETUP_HELP)
+    sys.stdout.flush()
 
 if __name__ == "__main__":
     main()
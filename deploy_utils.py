@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the AI Discussion Manager GitHub deployment scripts
+"""
+
+import os
+
+def find_present_files(files):
+    """Return the subset of files that exist, listing each directory only once"""
+    listings = {}
+    present = set()
+    for file in files:
+        directory, name = os.path.split(file)
+        if directory not in listings:
+            try:
+                with os.scandir(directory or '.') as entries:
+                    listings[directory] = {entry.name for entry in entries}
+            except OSError:
+                listings[directory] = set()
+        if name in listings[directory]:
+            present.add(file)
+    return present
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Shared .env bootstrap for the AI Discussion Manager setup and test scripts
+"""
+
+ENV_TEMPLATES = {
+    'supabase': """# Supabase Configuration
+SUPABASE_URL=https://your-project-id.supabase.co
+SUPABASE_KEY=your-supabase-anon-key
+
+# OpenAI Configuration
+OPENAI_API_KEY=your_openai_api_key_here
+""",
+    'full': """# AI Discussion Manager Configuration
+# Replace with your actual values
+
+# Database Configuration
+DB_HOST=localhost
+DB_USER=root
+DB_PASSWORD=your_mysql_password
+DB_NAME=ai_discussion_manager
+DB_PORT=3306
+
+# OpenAI Configuration
+OPENAI_API_KEY=sk-your_openai_api_key_here
+
+# Optional Settings
+MAX_WORD_LIMIT=150
+DEFAULT_DISCUSSION_ROUNDS=5
+DEBUG_MODE=false""",
+}
+
+def ensure_env_template(kind, path='.env'):
+    """Write the named template to path unless it already exists
+
+    Returns True if the template was written. Exclusive create checks and
+    writes in one open call, so repeat calls are cheap and never overwrite.
+    """
+    try:
+        with open(path, 'x') as f:
+            f.write(ENV_TEMPLATES[kind])
+    except FileExistsError:
+        return False
+    return True
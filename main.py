@@ -1,26 +1,41 @@
 import streamlit as st
-import openai
-import time
-from datetime import datetime
-from supabase import create_client, Client
+from datetime import datetime, timezone
 import os
-import json
 from dotenv import load_dotenv
 import re
+import base64
+import codecs
+import copy
+import gzip
 import hashlib
-from typing import Dict, List, Optional, Tuple
-import requests
-import mimetypes
+import heapq
+from itertools import islice
+import operator
+import uuid
 import zipfile
 from io import BytesIO
-import tempfile
-import shutil
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from prompts import build_team_prompt
+
+# openai and supabase pull in httpx, pydantic and friends, so they are imported
+# inside the functions that need them rather than on every cold start
+if TYPE_CHECKING:
+    import openai
+    from supabase import Client
 
 # Load environment variables from .env file
 load_dotenv()
 
 # API Configuration
 DEFAULT_OPENAI_MODELS = ["gpt-4o-mini", "gpt-4", "gpt-3.5-turbo"]
+SUPABASE_URL = os.getenv('SUPABASE_URL')
+SUPABASE_KEY = os.getenv('SUPABASE_KEY')
+
+# GitHub repository import is still a stub; its tab is only shown when explicitly enabled
+ENABLE_GITHUB_IMPORT = os.getenv('ENABLE_GITHUB_IMPORT', '').lower() in ('1', 'true', 'yes')
 
 # Theme Configuration
 THEMES = {
@@ -53,19 +68,23 @@ THEMES = {
     }
 }
 
+@st.cache_resource(show_spinner=False)
+def _get_openai_client(api_key: str) -> "openai.OpenAI":
+    """Create an OpenAI client once per key so its connection pool survives reruns"""
+    import openai
+    return openai.OpenAI(api_key=api_key)
+
 def verify_openai_api_key(api_key: str) -> Tuple[bool, str]:
     """Verify OpenAI API key by making a test request"""
     if not api_key or not api_key.startswith('sk-'):
         return False, "❌ Invalid API key format. OpenAI keys should start with 'sk-'"
 
+    import openai
+
     try:
-        client = openai.OpenAI(api_key=api_key)
-        # Test with a minimal request
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role": "user", "content": "Hello"}],
-            max_tokens=5
-        )
+        client = _get_openai_client(api_key)
+        # Listing models checks the key without spending tokens on a generation
+        client.models.list(timeout=5)
         return True, "✅ OpenAI API key verified successfully!"
     except openai.AuthenticationError:
         return False, "❌ Invalid API key. Please check your OpenAI API key."
@@ -83,9 +102,10 @@ def verify_supabase_credentials(url: str, key: str) -> Tuple[bool, str]:
         return False, "❌ Invalid Supabase key format. Key should be longer."
 
     try:
-        supabase = create_client(url, key)
-        # Test connection by trying to get table info
-        result = supabase.table('conversations').select('id').limit(1).execute()
+        supabase = _get_supabase_client(url, key)
+        # Test connection without transferring rows; a GET (not HEAD) keeps the
+        # error body, which is needed to recognise a missing table below
+        supabase.table('conversations').select('id').limit(0).execute()
         return True, "✅ Supabase credentials verified successfully!"
     except Exception as e:
         error_msg = str(e).lower()
@@ -96,76 +116,82 @@ def verify_supabase_credentials(url: str, key: str) -> Tuple[bool, str]:
         else:
             return False, f"❌ Supabase verification failed: {str(e)}"
 
-def initialize_apis(openai_key: str = None, supabase_url: str = None, supabase_key: str = None) -> Dict[str, any]:
-    """Initialize and verify API connections"""
-    results = {
-        "openai": {"verified": False, "message": "", "client": None},
-        "supabase": {"verified": False, "message": "", "client": None}
-    }
-
-    # Verify OpenAI
-    if openai_key:
-        verified, message = verify_openai_api_key(openai_key)
-        results["openai"]["verified"] = verified
-        results["openai"]["message"] = message
-        if verified:
-            results["openai"]["client"] = openai.OpenAI(api_key=openai_key)
+# File Analysis Functions
+_PY_FUNC_RE = re.compile(r'def\s+(\w+)\s*\(')
+_PY_CLASS_RE = re.compile(r'class\s+(\w+)\s*[:\(]')
+_PY_IMPORT_RE = re.compile(r'(?:from\s+[\w.]+\s+import|import\s+[\w.]+)')
+
+_JS_FUNC_RE = re.compile(r'(?:function\s+(\w+)|const\s+(\w+)\s*=\s*(?:\([^)]*\)\s*)?=>\s*\{?|(?:async\s+)?(?:function\s+)?(\w+)\s*\([^)]*\)\s*\{)')
+_JS_CLASS_RE = re.compile(r'class\s+(\w+)')
+_JS_IMPORT_RE = re.compile(r'import\s+.*?from\s+[\'"]([^\'"]+)[\'"]')
+
+_JAVA_FUNC_RE = re.compile(r'(?:public|private|protected)?\s*\w+\s+(\w+)\s*\([^)]*\)')
+_JAVA_CLASS_RE = re.compile(r'class\s+(\w+)')
+_JAVA_IMPORT_RE = re.compile(r'import\s+([^;]+);')
+
+_FUNCTION_KEYWORD_RE = re.compile(r'function\s+\w+')
+_BRANCH_RE = re.compile(r'\b(?:for|while|if)\b')
+
+# Language detection by file extension
+_EXT_TO_LANG = {
+    '.py': 'python', '.js': 'javascript', '.ts': 'typescript', '.tsx': 'typescript',
+    '.jsx': 'javascript', '.java': 'java', '.cpp': 'cpp', '.c': 'c', '.cs': 'csharp',
+    '.php': 'php', '.rb': 'ruby', '.go': 'go', '.rs': 'rust', '.swift': 'swift',
+    '.kt': 'kotlin', '.scala': 'scala', '.html': 'html', '.css': 'css', '.scss': 'scss',
+    '.sass': 'sass', '.less': 'less', '.json': 'json', '.xml': 'xml', '.yaml': 'yaml',
+    '.yml': 'yaml', '.toml': 'toml', '.md': 'markdown', '.txt': 'text', '.sql': 'sql',
+    '.sh': 'bash', '.ps1': 'powershell', '.r': 'r', '.m': 'matlab', '.pl': 'perl',
+    '.lua': 'lua', '.dart': 'dart', '.vb': 'vb', '.fs': 'fsharp'
+}
 
-    # Verify Supabase
-    if supabase_url and supabase_key:
-        verified, message = verify_supabase_credentials(supabase_url, supabase_key)
-        results["supabase"]["verified"] = verified
-        results["supabase"]["message"] = message
-        if verified:
-            results["supabase"]["client"] = create_client(supabase_url, supabase_key)
+# Uploads larger than this are analyzed from their first MAX_ANALYZE_BYTES only
+MAX_ANALYZE_BYTES = 2 * 1024 * 1024
 
-    return results
+# Content signatures for files without a known extension. The lookahead
+# reports every marker even where one starts inside another; 'import java'
+# shares its start with 'import ', which the caller adds back.
+_SNIFF_WINDOW = 4096
+_LANG_SNIFF_RE = re.compile(
+    r'(?=(<\?php|using system|#include|int main|cout|public class|import java|import |def |class |function|const |=>|export))'
+)
 
-# File Analysis Functions
 def detect_language_from_file(file_path: str, content: str = None) -> str:
     """Detect programming language from file extension and content"""
     if not file_path:
         return "unknown"
 
     # Language detection by extension
-    ext_to_lang = {
-        '.py': 'python', '.js': 'javascript', '.ts': 'typescript', '.tsx': 'typescript',
-        '.jsx': 'javascript', '.java': 'java', '.cpp': 'cpp', '.c': 'c', '.cs': 'csharp',
-        '.php': 'php', '.rb': 'ruby', '.go': 'go', '.rs': 'rust', '.swift': 'swift',
-        '.kt': 'kotlin', '.scala': 'scala', '.html': 'html', '.css': 'css', '.scss': 'scss',
-        '.sass': 'sass', '.less': 'less', '.json': 'json', '.xml': 'xml', '.yaml': 'yaml',
-        '.yml': 'yaml', '.toml': 'toml', '.md': 'markdown', '.txt': 'text', '.sql': 'sql',
-        '.sh': 'bash', '.ps1': 'powershell', '.r': 'r', '.m': 'matlab', '.pl': 'perl',
-        '.lua': 'lua', '.dart': 'dart', '.vb': 'vb', '.fs': 'fsharp'
-    }
-
-    _, ext = os.path.splitext(file_path.lower())
-    if ext in ext_to_lang:
-        return ext_to_lang[ext]
+    lang = _EXT_TO_LANG.get(os.path.splitext(file_path)[1].lower())
+    if lang:
+        return lang
 
     # Content-based detection for files without extensions
     if content:
-        content_lower = content.lower()
-        if 'import ' in content_lower and ('def ' in content_lower or 'class ' in content_lower):
+        # Signatures show up near the top, so sniff a small lowered window in one pass
+        found = {match.group(1) for match in _LANG_SNIFF_RE.finditer(content[:_SNIFF_WINDOW].lower())}
+        if 'import java' in found:
+            found.add('import ')
+        if 'import ' in found and ('def ' in found or 'class ' in found):
             return 'python'
-        if ('function' in content_lower or 'const ' in content_lower) and ('=>' in content or 'export' in content_lower):
+        if ('function' in found or 'const ' in found) and ('=>' in found or 'export' in found):
             return 'javascript'
-        if '<?php' in content_lower:
+        if '<?php' in found:
             return 'php'
-        if ('public class' in content_lower or 'import java' in content_lower):
+        if 'public class' in found or 'import java' in found:
             return 'java'
-        if ('#include' in content_lower and ('int main' in content_lower or 'cout' in content_lower)):
+        if '#include' in found and ('int main' in found or 'cout' in found):
             return 'cpp'
-        if 'using system' in content_lower:
+        if 'using system' in found:
             return 'csharp'
 
     return 'unknown'
 
+@st.cache_data(max_entries=256, show_spinner=False)
 def analyze_code_file(file_path: str, content: str) -> Dict[str, any]:
-    """Analyze a code file and extract useful information"""
+    """Analyze a code file and extract useful information; cached per name and content"""
     analysis = {
         "language": detect_language_from_file(file_path, content),
-        "lines": len(content.split('\n')),
+        "lines": content.count('\n') + 1,
         "characters": len(content),
         "functions": [],
         "classes": [],
@@ -176,26 +202,27 @@ def analyze_code_file(file_path: str, content: str) -> Dict[str, any]:
     }
 
     # Language-specific analysis
-    if analysis["language"] == "python":
-        analysis.update(analyze_python_file(content))
-    elif analysis["language"] in ["javascript", "typescript"]:
-        analysis.update(analyze_js_file(content))
-    elif analysis["language"] == "java":
-        analysis.update(analyze_java_file(content))
+    analyzer = _LANGUAGE_ANALYZERS.get(analysis["language"])
+    if analyzer:
+        analysis.update(analyzer(content))
 
     # Calculate complexity
-    analysis["complexity"] = calculate_complexity(content, analysis["language"])
+    analysis["complexity"] = calculate_complexity(content, analysis["language"], analysis)
 
     # Generate suggestions
     analysis["suggestions"] = generate_code_suggestions(analysis)
 
     return analysis
 
+def _findall_if(pattern, content: str, marker: str) -> List[str]:
+    """Run pattern.findall only if the literal every match must contain is present"""
+    return pattern.findall(content) if marker in content else []
+
 def analyze_python_file(content: str) -> Dict[str, List[str]]:
     """Analyze Python file content"""
-    functions = re.findall(r'def\s+(\w+)\s*\(', content)
-    classes = re.findall(r'class\s+(\w+)\s*[:\(]', content)
-    imports = re.findall(r'(?:from\s+[\w.]+\s+import|import\s+[\w.]+)', content)
+    functions = _findall_if(_PY_FUNC_RE, content, 'def')
+    classes = _findall_if(_PY_CLASS_RE, content, 'class')
+    imports = _findall_if(_PY_IMPORT_RE, content, 'import')
 
     return {
         "functions": functions,
@@ -205,11 +232,11 @@ def analyze_python_file(content: str) -> Dict[str, List[str]]:
 
 def analyze_js_file(content: str) -> Dict[str, List[str]]:
     """Analyze JavaScript/TypeScript file content"""
-    functions = re.findall(r'(?:function\s+(\w+)|const\s+(\w+)\s*=\s*(?:\([^)]*\)\s*)?=>\s*\{?|(?:async\s+)?(?:function\s+)?(\w+)\s*\([^)]*\)\s*\{)', content)
+    functions = _JS_FUNC_RE.findall(content)
     functions = [f for group in functions for f in group if f]  # Flatten and filter
 
-    classes = re.findall(r'class\s+(\w+)', content)
-    imports = re.findall(r'import\s+.*?from\s+[\'"]([^\'"]+)[\'"]', content)
+    classes = _findall_if(_JS_CLASS_RE, content, 'class')
+    imports = _findall_if(_JS_IMPORT_RE, content, 'import')
 
     return {
         "functions": functions,
@@ -219,9 +246,9 @@ def analyze_js_file(content: str) -> Dict[str, List[str]]:
 
 def analyze_java_file(content: str) -> Dict[str, List[str]]:
     """Analyze Java file content"""
-    functions = re.findall(r'(?:public|private|protected)?\s*\w+\s+(\w+)\s*\([^)]*\)', content)
-    classes = re.findall(r'class\s+(\w+)', content)
-    imports = re.findall(r'import\s+([^;]+);', content)
+    functions = _findall_if(_JAVA_FUNC_RE, content, '(')
+    classes = _findall_if(_JAVA_CLASS_RE, content, 'class')
+    imports = _findall_if(_JAVA_IMPORT_RE, content, 'import')
 
     return {
         "functions": functions,
@@ -229,11 +256,22 @@ def analyze_java_file(content: str) -> Dict[str, List[str]]:
         "imports": imports
     }
 
-def calculate_complexity(content: str, language: str) -> str:
-    """Calculate code complexity"""
-    lines = len(content.split('\n'))
-    functions = len(re.findall(r'def\s+\w+' if language == 'python' else r'function\s+\w+', content))
-    loops = len(re.findall(r'(for|while|if)\s*\(', content))
+# Language-specific analyzers; other languages only get the generic metrics
+_LANGUAGE_ANALYZERS = {
+    "python": analyze_python_file,
+    "javascript": analyze_js_file,
+    "typescript": analyze_js_file,
+    "java": analyze_java_file
+}
+
+def calculate_complexity(content: str, language: str, analysis: Dict[str, any]) -> str:
+    """Calculate code complexity, reusing the counts already in the analysis"""
+    lines = analysis["lines"]
+    if language in _LANGUAGE_ANALYZERS:
+        functions = len(analysis["functions"])
+    else:
+        functions = len(_findall_if(_FUNCTION_KEYWORD_RE, content, 'function'))
+    loops = len(_BRANCH_RE.findall(content))
     complexity_score = functions + loops + (lines // 50)
 
     if complexity_score < 5:
@@ -261,44 +299,43 @@ def generate_code_suggestions(analysis: Dict[str, any]) -> List[str]:
 
     return suggestions
 
-def analyze_folder_structure(folder_path: str) -> Dict[str, any]:
-    """Analyze project folder structure"""
+def analyze_zip_structure(zip_ref) -> Dict[str, any]:
+    """Analyze the structure of an open ZIP archive from its directory, without extracting it"""
+    entries = []
+    folders = {}
+    for info in zip_ref.infolist():
+        parts = info.filename.rstrip('/').split('/')
+        # Folders may be stored explicitly or only implied by file paths
+        folder_depth = len(parts) if info.is_dir() else len(parts) - 1
+        for depth in range(1, folder_depth + 1):
+            folders.setdefault('/'.join(parts[:depth]), None)
+        if not info.is_dir():
+            entries.append((parts[-1], info.file_size))
+
+    return summarize_file_listing(entries, list(folders))
+
+def summarize_file_listing(files: List[Tuple[str, Optional[int]]], folders: List[str]) -> Dict[str, any]:
+    """Build the structure analysis from (file name, size or None) pairs and folder paths"""
     structure = {
-        "total_files": 0,
+        "total_files": len(files),
         "languages": {},
-        "folders": [],
+        "folders": folders,
         "file_types": {},
         "largest_files": [],
         "project_type": "unknown"
     }
 
-    for root, dirs, files in os.walk(folder_path):
-        # Count folders
-        for dir_name in dirs:
-            structure["folders"].append(os.path.join(root, dir_name))
-
-        # Analyze files
-        for file in files:
-            file_path = os.path.join(root, file)
-            structure["total_files"] += 1
-
-            # Get file size
-            try:
-                size = os.path.getsize(file_path)
-                structure["largest_files"].append((file, size))
-            except:
-                pass
-
-            # Detect language
-            lang = detect_language_from_file(file)
-            structure["languages"][lang] = structure["languages"].get(lang, 0) + 1
-
-            # File type analysis
-            _, ext = os.path.splitext(file.lower())
-            structure["file_types"][ext] = structure["file_types"].get(ext, 0) + 1
+    for file, size in files:
+        if size is not None:
+            structure["largest_files"].append((file, size))
+        _, ext = os.path.splitext(file.lower())
+        # Without content, language detection is just the extension lookup
+        lang = _EXT_TO_LANG.get(ext, 'unknown')
+        structure["languages"][lang] = structure["languages"].get(lang, 0) + 1
+        structure["file_types"][ext] = structure["file_types"].get(ext, 0) + 1
 
     # Sort largest files
-    structure["largest_files"] = sorted(structure["largest_files"], key=lambda x: x[1], reverse=True)[:10]
+    structure["largest_files"] = heapq.nlargest(10, structure["largest_files"], key=operator.itemgetter(1))
 
     # Determine project type
     if structure["languages"].get("python", 0) > structure["total_files"] * 0.3:
@@ -310,18 +347,33 @@ def analyze_folder_structure(folder_path: str) -> Dict[str, any]:
 
     return structure
 
+@st.cache_resource
+def _get_supabase_client(url: str, key: str) -> "Client":
+    """Create a Supabase client once and share it across reruns and sessions"""
+    from supabase import create_client
+    return create_client(url, key)
+
 def get_db_connection():
-    """Create and return Supabase client"""
+    """Return the shared Supabase client"""
     try:
         if not SUPABASE_URL or not SUPABASE_KEY:
             st.error("Supabase configuration missing. Please check SUPABASE_URL and SUPABASE_KEY environment variables.")
             return None
-        supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
-        return supabase
+        return _get_supabase_client(SUPABASE_URL, SUPABASE_KEY)
     except Exception as e:
         st.error(f"Supabase connection failed: {e}")
         return None
 
+@st.cache_resource(show_spinner=False)
+def _schema_ready(_supabase) -> bool:
+    """Probe for the conversations table once per process
+
+    A failed probe raises, and exceptions are not cached, so a missing
+    schema is checked again once the tables have been created.
+    """
+    _supabase.table('conversations').select('id', count='exact', head=True).execute()
+    return True
+
 def create_database_schema():
     """Create database tables if they don't exist"""
     supabase = get_db_connection()
@@ -329,8 +381,7 @@ def create_database_schema():
         return False
 
     try:
-        # Create conversations table
-        supabase.table('conversations').select('*').limit(1).execute()  # Test if table exists
+        return _schema_ready(supabase)
     except:
         # Table doesn't exist, create it
         try:
@@ -345,9 +396,10 @@ conversations:
 - created_at: timestamp with time zone (default: now())
 - updated_at: timestamp with time zone (default: now())
 - status: text (check constraint: 'active', 'completed', 'cancelled')
-- teams: text
+- teams: jsonb
 - uploaded_file_name: text
 - uploaded_file_content: text
+- uploaded_file_content_encoding: text (default: 'plain'; 'gzip' means base64-encoded gzip)
 
 messages:
 - id: integer (primary key, auto-increment)
@@ -363,6 +415,7 @@ generated_files:
 - file_type: text (check constraint: 'markdown', 'prompt', 'cursor_guide')
 - file_name: text
 - file_content: text
+- file_content_encoding: text (default: 'plain'; 'gzip' means base64-encoded gzip)
 - created_at: timestamp with time zone (default: now())
             """)
             return False
@@ -370,8 +423,6 @@ generated_files:
             st.error(f"Failed to create database schema: {e}")
             return False
 
-        return True
-
 def save_conversation_to_db(session_id, project_title, teams, uploaded_file_name=None, uploaded_file_content=None):
     """Save conversation metadata to database"""
     supabase = get_db_connection()
@@ -382,11 +433,13 @@ def save_conversation_to_db(session_id, project_title, teams, uploaded_file_name
         data = {
             'session_id': session_id,
             'project_title': project_title,
-            'teams': json.dumps(teams) if teams else None,
+            'teams': teams or None,
             'uploaded_file_name': uploaded_file_name,
-            'uploaded_file_content': uploaded_file_content
+            'uploaded_file_content': encode_file_content(uploaded_file_content) if uploaded_file_content else uploaded_file_content,
+            'uploaded_file_content_encoding': 'gzip' if uploaded_file_content else 'plain'
         }
         result = supabase.table('conversations').insert(data).execute()
+        _fetch_conversation_history.clear()
         if result.data:
             return result.data[0]['id']
         return None
@@ -394,69 +447,163 @@ def save_conversation_to_db(session_id, project_title, teams, uploaded_file_name
         st.error(f"Failed to save conversation: {e}")
         return None
 
-def save_message_to_db(conversation_id, role, content, model=None):
-    """Save individual message to database"""
+def encode_file_content(text: str) -> str:
+    """Compress generated or uploaded file text for storage in a text column"""
+    return base64.b64encode(gzip.compress(text.encode('utf-8'))).decode('ascii')
+
+def decode_file_content(stored: str, encoding: str) -> str:
+    """Reverse encode_file_content; rows saved before compression are 'plain'"""
+    if encoding == 'gzip':
+        return gzip.decompress(base64.b64decode(stored)).decode('utf-8')
+    return stored
+
+def save_turn_to_db(conversation_id, message_rows=None, generated_files_rows=None):
+    """Save messages and generated files with one bulk insert per table
+
+    message_rows is a list of dicts with 'role', 'content' and optional
+    'model' and 'timestamp'; generated_files_rows is a list of
+    (file_type, file_name, file_content) tuples. When both are given the
+    two inserts run concurrently.
+    """
     supabase = get_db_connection()
     if not supabase:
         return False
 
+    inserts = []
+    if message_rows:
+        inserts.append(('messages', [
+            {
+                'conversation_id': conversation_id,
+                'role': row['role'],
+                'content': row['content'],
+                'model': row.get('model'),
+                # Rows in one insert would otherwise share the same NOW() and lose their order
+                **({'timestamp': row['timestamp']} if row.get('timestamp') else {})
+            }
+            for row in message_rows
+        ]))
+    if generated_files_rows:
+        inserts.append(('generated_files', [
+            {
+                'conversation_id': conversation_id,
+                'file_type': file_type,
+                'file_name': file_name,
+                'file_content': encode_file_content(file_content),
+                'file_content_encoding': 'gzip'
+            }
+            for file_type, file_name, file_content in generated_files_rows
+        ]))
+    if not inserts:
+        return True
+
+    def insert_rows(table, rows):
+        result = supabase.table(table).insert(rows).execute()
+        return len(result.data) == len(rows)
+
     try:
-        data = {
-            'conversation_id': conversation_id,
-            'role': role,
-            'content': content,
-            'model': model
-        }
-        result = supabase.table('messages').insert(data).execute()
-        return len(result.data) > 0
+        if len(inserts) == 1:
+            saved = insert_rows(*inserts[0])
+        else:
+            with ThreadPoolExecutor(max_workers=len(inserts)) as executor:
+                futures = [executor.submit(insert_rows, table, rows) for table, rows in inserts]
+            saved = all(future.result() for future in futures)
+        # Cached conversation reads are now stale
+        _fetch_conversation.clear()
+        return saved
     except Exception as e:
-        st.error(f"Failed to save message: {e}")
+        st.error(f"Failed to save to database: {e}")
         return False
 
+def queue_message_for_db(role, content, model=None):
+    """Hold a message for the next flush_pending_messages() instead of inserting it now"""
+    st.session_state.pending_message_rows.append({
+        'role': role,
+        'content': content,
+        'model': model,
+        'timestamp': datetime.now(timezone.utc).isoformat()
+    })
+
+def flush_pending_messages(conversation_id):
+    """Insert all queued messages for the conversation in one request"""
+    pending = st.session_state.pending_message_rows
+    if not pending or not conversation_id:
+        return True
+    if save_turn_to_db(conversation_id, message_rows=pending):
+        st.session_state.pending_message_rows = []
+        return True
+    return False
+
 def save_generated_file_to_db(conversation_id, file_type, file_name, file_content):
     """Save generated file to database"""
-    supabase = get_db_connection()
-    if not supabase:
-        return False
+    return save_turn_to_db(conversation_id, generated_files_rows=[(file_type, file_name, file_content)])
+
+# The sidebar lists only the newest few conversations, so older rows are never fetched
+HISTORY_LIMIT = 5
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _fetch_conversation_history(_supabase):
+    """Query the newest conversations; cached so widget reruns don't hit Supabase"""
+    # teams is a jsonb column, so PostgREST already returns it as a list
+    result = (
+        _supabase.table('conversations')
+        .select('id, session_id, project_title, created_at, status, teams')
+        .order('created_at', desc=True)
+        .limit(HISTORY_LIMIT)
+        .execute()
+    )
+    return result.data
 
-    try:
-        data = {
-            'conversation_id': conversation_id,
-            'file_type': file_type,
-            'file_name': file_name,
-            'file_content': file_content
-        }
-        result = supabase.table('generated_files').insert(data).execute()
-        return len(result.data) > 0
-    except Exception as e:
-        st.error(f"Failed to save generated file: {e}")
-        return False
+def load_conversation_history(refresh=False):
+    """Load conversation history list from database
 
-def load_conversation_history():
-    """Load conversation history list from database"""
+    The list is cached for a short while; pass refresh=True to query again.
+    """
     supabase = get_db_connection()
     if not supabase:
         return None
 
-    try:
-        result = supabase.table('conversations').select('id, session_id, project_title, created_at, status, teams').order('created_at', desc=True).execute()
-
-        conversations = result.data
-
-        # Convert teams JSON string back to list
-        for conv in conversations:
-            if conv.get('teams'):
-                try:
-                    conv['teams'] = json.loads(conv['teams'])
-                except:
-                    conv['teams'] = []
-
-        return conversations
+    if refresh:
+        _fetch_conversation_history.clear()
 
+    try:
+        return _fetch_conversation_history(supabase)
     except Exception as e:
         st.error(f"Failed to load conversation history: {e}")
         return None
 
+@st.cache_data(ttl=300, show_spinner=False)
+def _fetch_conversation(_supabase, session_id):
+    """Query one conversation with its messages and files; cached per session_id
+
+    Saves made through save_turn_to_db clear this cache, so the TTL only bounds
+    how long writes from other server processes can go unseen.
+    """
+    # Embed messages and generated files through their foreign keys so everything
+    # comes back in a single request
+    conv_result = _supabase.table('conversations').select(
+        '*, '
+        'messages(role, content, model, timestamp), '
+        'generated_files(file_type, file_name, file_content, file_content_encoding, created_at)'
+    ).eq('session_id', session_id).execute()
+    if not conv_result.data:
+        return None
+
+    conversation = conv_result.data[0]
+    if conversation.get('uploaded_file_content'):
+        conversation['uploaded_file_content'] = decode_file_content(
+            conversation['uploaded_file_content'], conversation.get('uploaded_file_content_encoding', 'plain')
+        )
+    messages = sorted(conversation.pop('messages') or [], key=operator.itemgetter('timestamp'))
+    files = sorted(conversation.pop('generated_files') or [], key=operator.itemgetter('created_at'), reverse=True)
+    for file in files:
+        file['file_content'] = decode_file_content(file['file_content'], file.pop('file_content_encoding', 'plain'))
+
+    return {
+        'conversation': conversation,
+        'messages': messages,
+        'files': files
+    }
+
 def load_conversation_from_db(session_id):
     """Load conversation data from database"""
     supabase = get_db_connection()
@@ -464,27 +611,7 @@ def load_conversation_from_db(session_id):
         return None
 
     try:
-        # Get conversation
-        conv_result = supabase.table('conversations').select('*').eq('session_id', session_id).execute()
-        if not conv_result.data:
-            return None
-
-        conversation = conv_result.data[0]
-
-        # Get messages
-        msg_result = supabase.table('messages').select('role, content, model, timestamp').eq('conversation_id', conversation['id']).order('timestamp').execute()
-        messages = msg_result.data
-
-        # Get generated files
-        files_result = supabase.table('generated_files').select('file_type, file_name, file_content, created_at').eq('conversation_id', conversation['id']).order('created_at', desc=True).execute()
-        files = files_result.data
-
-        return {
-            'conversation': conversation,
-            'messages': messages,
-            'files': files
-        }
-
+        return _fetch_conversation(supabase, session_id)
     except Exception as e:
         st.error(f"Failed to load conversation: {e}")
         return None
@@ -513,245 +640,44 @@ st.set_page_config(
     }
 )
 
-# Custom CSS for Modern UI
+# Custom CSS for Modern UI. The stylesheet lives in static/ (see .streamlit/config.toml)
+# so each rerun only sends a link tag and the browser caches the CSS itself.
+CSS_URL = "app/static/styles.css"
+
 def load_css():
     """Load custom CSS for modern styling"""
-    st.markdown("""
-    <style>
-    /* Modern CSS for AI Code Analyst Pro */
-
-    /* Main container styling */
-    .main-header {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        padding: 2rem;
-        border-radius: 15px;
-        margin-bottom: 2rem;
-        text-align: center;
-        box-shadow: 0 10px 30px rgba(0,0,0,0.2);
-    }
-
-    .main-header h1 {
-        font-size: 3rem;
-        font-weight: 700;
-        margin-bottom: 0.5rem;
-        text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-    }
-
-    .main-header p {
-        font-size: 1.2rem;
-        opacity: 0.9;
-        margin: 0;
-    }
-
-    /* Card styling */
-    .modern-card {
-        background: white;
-        border-radius: 15px;
-        padding: 2rem;
-        margin: 1rem 0;
-        box-shadow: 0 8px 25px rgba(0,0,0,0.1);
-        border: 1px solid #e1e5e9;
-        transition: all 0.3s ease;
-    }
-
-    .modern-card:hover {
-        transform: translateY(-5px);
-        box-shadow: 0 15px 35px rgba(0,0,0,0.15);
-    }
-
-    .modern-card h3 {
-        color: #2c3e50;
-        margin-bottom: 1rem;
-        font-size: 1.5rem;
-    }
-
-    /* Status indicators */
-    .status-success {
-        background: linear-gradient(135deg, #4CAF50, #45a049);
-        color: white;
-        padding: 0.5rem 1rem;
-        border-radius: 25px;
-        font-weight: 600;
-        display: inline-block;
-        margin: 0.5rem 0;
-    }
-
-    .status-error {
-        background: linear-gradient(135deg, #f44336, #d32f2f);
-        color: white;
-        padding: 0.5rem 1rem;
-        border-radius: 25px;
-        font-weight: 600;
-        display: inline-block;
-        margin: 0.5rem 0;
-    }
-
-    .status-warning {
-        background: linear-gradient(135deg, #ff9800, #f57c00);
-        color: white;
-        padding: 0.5rem 1rem;
-        border-radius: 25px;
-        font-weight: 600;
-        display: inline-block;
-        margin: 0.5rem 0;
-    }
-
-    /* Button styling */
-    .modern-button {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        border: none;
-        padding: 0.75rem 2rem;
-        border-radius: 25px;
-        font-weight: 600;
-        cursor: pointer;
-        transition: all 0.3s ease;
-        text-decoration: none;
-        display: inline-block;
-        margin: 0.5rem;
-    }
-
-    .modern-button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 8px 25px rgba(102, 126, 234, 0.3);
-    }
-
-    /* Progress bar styling */
-    .progress-container {
-        background: #f0f2f5;
-        border-radius: 10px;
-        height: 8px;
-        margin: 1rem 0;
-        overflow: hidden;
-    }
-
-    .progress-bar {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        height: 100%;
-        border-radius: 10px;
-        transition: width 0.3s ease;
-    }
-
-    /* Code analysis cards */
-    .analysis-card {
-        background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
-        color: white;
-        padding: 1.5rem;
-        border-radius: 15px;
-        margin: 1rem 0;
-        text-align: center;
-    }
-
-    .analysis-card h4 {
-        margin: 0 0 0.5rem 0;
-        font-size: 1.2rem;
-    }
-
-    .analysis-card .metric {
-        font-size: 2rem;
-        font-weight: 700;
-        margin: 0;
-    }
-
-    /* File upload styling */
-    .upload-zone {
-        border: 2px dashed #667eea;
-        border-radius: 15px;
-        padding: 2rem;
-        text-align: center;
-        background: #f8f9ff;
-        transition: all 0.3s ease;
-        margin: 1rem 0;
-    }
-
-    .upload-zone:hover {
-        background: #eef2ff;
-        border-color: #764ba2;
-    }
-
-    /* Sidebar styling */
-    .sidebar-header {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        padding: 1.5rem;
-        border-radius: 10px;
-        margin-bottom: 1rem;
-        text-align: center;
-    }
-
-    /* Animation for loading states */
-    @keyframes pulse {
-        0% { opacity: 1; }
-        50% { opacity: 0.5; }
-        100% { opacity: 1; }
-    }
-
-    .loading {
-        animation: pulse 1.5s infinite;
-    }
-
-    /* Theme toggle */
-    .theme-toggle {
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        margin: 1rem 0;
-    }
-
-    .theme-toggle button {
-        background: none;
-        border: 2px solid #667eea;
-        border-radius: 50%;
-        width: 50px;
-        height: 50px;
-        cursor: pointer;
-        transition: all 0.3s ease;
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        font-size: 1.5rem;
-    }
-
-    .theme-toggle button:hover {
-        background: #667eea;
-        color: white;
-    }
-
-    /* Responsive design */
-    @media (max-width: 768px) {
-        .main-header h1 {
-            font-size: 2rem;
-        }
-
-        .modern-card {
-            padding: 1rem;
-        }
-
-        .main-header {
-            padding: 1rem;
-        }
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    st.markdown(f'<link rel="stylesheet" href="{CSS_URL}">', unsafe_allow_html=True)
 
 # Initialize session state
+# Per-session defaults; each session gets its own copy of the mutable ones
+_SESSION_DEFAULTS = {
+    'apis_verified': False,
+    'openai_client': None,
+    'supabase_client': None,
+    'theme': "light",
+    'uploaded_files': [],
+    'analysis_results': {},
+    'current_page': "dashboard",
+    'messages': [],
+    'discussion_active': False,
+    'teams': [],
+    'uploaded_file_content_gz': b"",
+    'uploaded_file_hash': "",
+    'uploaded_file_name': "",
+    'conversation_id': None,
+    'generated_files': [],
+    'pending_message_rows': [],
+    'discussion_context': [],
+    'ai_message_count': 0,
+    'team_counts': {},
+}
+
 def initialize_session_state():
     """Initialize all session state variables"""
-    if 'apis_verified' not in st.session_state:
-        st.session_state.apis_verified = False
-    if 'openai_client' not in st.session_state:
-        st.session_state.openai_client = None
-    if 'supabase_client' not in st.session_state:
-        st.session_state.supabase_client = None
-    if 'theme' not in st.session_state:
-        st.session_state.theme = "light"
-    if 'uploaded_files' not in st.session_state:
-        st.session_state.uploaded_files = []
-    if 'analysis_results' not in st.session_state:
-        st.session_state.analysis_results = {}
-    if 'current_page' not in st.session_state:
-        st.session_state.current_page = "dashboard"
+    for key, default in _SESSION_DEFAULTS.items():
+        st.session_state.setdefault(key, copy.copy(default))
+    if 'session_id' not in st.session_state:
+        st.session_state.session_id = str(uuid.uuid4())
 
 # Load CSS and initialize session state
 load_css()
@@ -761,62 +687,51 @@ initialize_session_state()
 if 'db_initialized' not in st.session_state:
     st.session_state.db_initialized = create_database_schema()
 
-# Initialize session state
-if 'messages' not in st.session_state:
-    st.session_state.messages = []
-if 'discussion_active' not in st.session_state:
-    st.session_state.discussion_active = False
-if 'openai_client' not in st.session_state:
-    st.session_state.openai_client = None
-if 'teams' not in st.session_state:
-    st.session_state.teams = []
-if 'uploaded_file_content' not in st.session_state:
-    st.session_state.uploaded_file_content = ""
-if 'uploaded_file_name' not in st.session_state:
-    st.session_state.uploaded_file_name = ""
-if 'conversation_id' not in st.session_state:
-    st.session_state.conversation_id = None
-if 'generated_files' not in st.session_state:
-    st.session_state.generated_files = []
-if 'session_id' not in st.session_state:
-    import uuid
-    st.session_state.session_id = str(uuid.uuid4())
+def initialize_openai(verify=False):
+    """Initialize OpenAI client using environment variable
 
-def initialize_openai():
-    """Initialize OpenAI client using environment variable"""
+    The billable test request is only sent when verify is True; otherwise the
+    first real call surfaces any authentication error.
+    """
     try:
+        if st.session_state.get('openai_client') is not None and st.session_state.get('apis_verified'):
+            return True, "✅ OpenAI initialized successfully!"
+
         openai_key = os.getenv('OPENAI_API_KEY')
         if not openai_key:
             return False, "❌ OPENAI_API_KEY not found in environment variables. Please set it in your .env file."
-
-        st.session_state.openai_client = openai.OpenAI(api_key=openai_key)
-        # Test call
-        _ = st.session_state.openai_client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": "Hello"}],
-            max_tokens=10
-        )
+        if not openai_key.startswith('sk-'):
+            return False, "❌ Invalid API key format. OpenAI keys should start with 'sk-'"
+
+        st.session_state.openai_client = _get_openai_client(openai_key)
+        if verify:
+            # Test call; listing models needs no generation
+            st.session_state.openai_client.models.list(timeout=5)
+            st.session_state.apis_verified = True
         return True, "✅ OpenAI initialized successfully!"
     except Exception as e:
         return False, f"Error initializing OpenAI: {str(e)}"
 
-def call_openai(messages, system_prompt=""):
-    """Call OpenAI API"""
+def call_openai_stream(messages, system_prompt=""):
+    """Call OpenAI API and yield the response text as it arrives"""
     try:
         full_messages = []
         if system_prompt:
             full_messages.append({"role": "system", "content": system_prompt})
         full_messages.extend(messages)
 
-        response = st.session_state.openai_client.chat.completions.create(
+        stream = st.session_state.openai_client.chat.completions.create(
             model="gpt-4o-mini",
             messages=full_messages,
             max_tokens=800,
-            temperature=0.7
+            temperature=0.7,
+            stream=True
         )
-        return response.choices[0].message.content
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
     except Exception as e:
-        return f"OpenAI Error: {str(e)}"
+        yield f"OpenAI Error: {str(e)}"
 
 def add_message(role, content, model=""):
     """Add message to conversation history"""
@@ -827,10 +742,61 @@ def add_message(role, content, model=""):
         "model": model,
         "timestamp": timestamp
     })
+    _track_discussion_message(content, model, first=len(st.session_state.messages) == 1)
+
+def _track_discussion_message(content, model, first):
+    """Extend the running OpenAI context and AI turn counts with one message"""
+    if model:
+        st.session_state.discussion_context.append({"role": "assistant", "content": content})
+        st.session_state.ai_message_count += 1
+        st.session_state.team_counts[model] = st.session_state.team_counts.get(model, 0) + 1
+    elif first:
+        st.session_state.discussion_context.append({"role": "user", "content": content})
+
+def reset_discussion_tracking(messages=()):
+    """Rebuild the running context and counters after the message list is replaced"""
+    st.session_state.discussion_context = []
+    st.session_state.ai_message_count = 0
+    st.session_state.team_counts = {}
+    st.session_state.message_window = RECENT_MESSAGE_LIMIT
+    for i, msg in enumerate(messages):
+        _track_discussion_message(msg["content"], msg.get("model"), first=i == 0)
+
+def reset_discussion(new_session=False):
+    """Save any queued messages, then clear the current discussion and its upload
+
+    Stored conversations are kept; new_session=True also starts a new session id.
+    """
+    flush_pending_messages(st.session_state.conversation_id)
+    st.session_state.messages = []
+    reset_discussion_tracking()
+    st.session_state.discussion_active = False
+    st.session_state.uploaded_file_content_gz = b""
+    st.session_state.uploaded_file_hash = ""
+    st.session_state.uploaded_file_name = ""
+    st.session_state.conversation_id = None
+    st.session_state.generated_files = []
+    st.session_state.generation_key = None
+    if new_session:
+        st.session_state.session_id = str(uuid.uuid4())
+
+# Long discussions render this many of the latest messages, and this many more per "show older" click
+RECENT_MESSAGE_LIMIT = 20
 
 def display_conversation():
-    """Display conversation history"""
-    for msg in st.session_state.messages:
+    """Display conversation history, collapsing older messages in long discussions"""
+    messages = st.session_state.messages
+    window = st.session_state.get('message_window', RECENT_MESSAGE_LIMIT)
+    hidden = len(messages) - window
+    if hidden > 0:
+        st.button(
+            f"⬆️ Show {min(hidden, RECENT_MESSAGE_LIMIT)} older messages ({hidden} hidden)",
+            key="show_older_messages",
+            on_click=lambda: st.session_state.update(message_window=window + RECENT_MESSAGE_LIMIT)
+        )
+        messages = messages[-window:]
+
+    for msg in messages:
         if msg["model"]:
             with st.chat_message("assistant", avatar="🟢"):
                 st.write(f"**{msg['model']}** - {msg['timestamp']}")
@@ -839,19 +805,40 @@ def display_conversation():
             with st.chat_message(msg["role"]):
                 st.write(msg["content"])
 
+@st.cache_data(max_entries=4, show_spinner=False)
+def _get_uploaded_text(blob_hash: str, _blob: bytes) -> str:
+    """Decompress an uploaded file at most once per unique upload"""
+    return gzip.decompress(_blob).decode('utf-8')
+
+def get_uploaded_file_content() -> str:
+    """Return the text of the uploaded file, or an empty string if none is loaded"""
+    if not st.session_state.uploaded_file_content_gz:
+        return ""
+    return _get_uploaded_text(st.session_state.uploaded_file_hash, st.session_state.uploaded_file_content_gz)
+
+_PROJECT_DOC_EXTS = frozenset({'.md', '.txt'})
+
+def _check_utf8(data, chunk_size=64 * 1024):
+    """Raise UnicodeDecodeError unless data is UTF-8, decoding a chunk at a time"""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    for start in range(0, len(data), chunk_size):
+        decoder.decode(data[start:start + chunk_size])
+    decoder.decode(b'', final=True)
+
 def process_uploaded_file(uploaded_file):
     """Process uploaded file and extract content"""
     if uploaded_file is not None:
         try:
             # Read file content based on type
-            if uploaded_file.name.lower().endswith('.md'):
-                content = uploaded_file.read().decode('utf-8')
-            elif uploaded_file.name.lower().endswith('.txt'):
-                content = uploaded_file.read().decode('utf-8')
-            else:
+            if os.path.splitext(uploaded_file.name)[1].lower() not in _PROJECT_DOC_EXTS:
                 return False, "Unsupported file type. Please upload .md or .txt files only."
+            # A view of the upload's own buffer, so the bytes are never copied
+            with uploaded_file.getbuffer() as encoded:
+                _check_utf8(encoded)  # Reject files that aren't valid UTF-8 text
 
-            st.session_state.uploaded_file_content = content
+                # Keep only a compressed copy in session state; see get_uploaded_file_content()
+                st.session_state.uploaded_file_content_gz = gzip.compress(encoded) if len(encoded) else b""
+                st.session_state.uploaded_file_hash = hashlib.sha256(encoded).hexdigest()
             st.session_state.uploaded_file_name = uploaded_file.name
             return True, f"✅ File '{uploaded_file.name}' loaded successfully!"
 
@@ -859,46 +846,7 @@ def process_uploaded_file(uploaded_file):
             return False, f"Error reading file: {str(e)}"
     return False, "No file uploaded."
 
-def generate_project_md_file(messages, project_title, teams):
-    """Generate a comprehensive MD file with project specifications and guidelines"""
-    md_content = f"""# {project_title}
-
-## 📋 Project Overview
-
-**Generated on:** {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-**Teams Involved:** {", ".join(teams)}
-**Status:** Active Development
-
----
-
-## 🎯 Project Goals & Requirements
-
-"""
-
-    # Extract user/project description from first message
-    if messages and messages[0]['role'] == 'user':
-        md_content += f"{messages[0]['content']}\n\n"
-
-    md_content += "## 👥 Team Analysis & Recommendations\n\n"
-
-    # Group messages by team
-    team_contributions = {}
-    for msg in messages[1:]:  # Skip the initial user message
-        if msg.get('model'):
-            team = msg['model']
-            if team not in team_contributions:
-                team_contributions[team] = []
-            team_contributions[team].append(msg['content'])
-
-    # Add team-specific sections
-    for team, contributions in team_contributions.items():
-        md_content += f"### 🔧 {team} Analysis\n\n"
-        for i, contribution in enumerate(contributions, 1):
-            # Clean and format the contribution
-            clean_contribution = contribution.replace("**", "").replace("*", "")
-            md_content += f"#### Contribution {i}\n{contribution}\n\n"
-
-    md_content += """## 📚 Implementation Guidelines
+_GUIDELINES_MD = """## 📚 Implementation Guidelines
 
 ### 🏗️ Architecture Recommendations
 - Follow modular design principles
@@ -943,27 +891,60 @@ def generate_project_md_file(messages, project_title, teams):
 *This document was generated by AI Discussion Manager - An intelligent collaborative development tool*
 """
 
-    return md_content
+# The generators are cached without their timestamp, which is filled in afterwards
+# so a cache hit never carries an earlier run's time
+_GENERATED_AT_PLACEHOLDER = "\x00generated_at\x00"
 
-def generate_cursor_prompt_file(messages, project_title, teams):
-    """Generate a comprehensive prompt file for Cursor IDE development"""
-    prompt_content = f"""# Cursor IDE Development Guidelines for {project_title}
+def _stamp_generated_at(document, generated_at=None):
+    """Fill in a cached document's timestamp, defaulting to now"""
+    generated_at = generated_at or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    return document.replace(_GENERATED_AT_PLACEHOLDER, generated_at, 1)
 
-## 📋 Project Context
+@st.cache_data(max_entries=32, show_spinner=False)
+def _project_md_template(messages, project_title, teams):
+    """Project specification markdown, with a placeholder where its timestamp goes"""
+    generated_at = _GENERATED_AT_PLACEHOLDER
+    parts = [f"""# {project_title}
 
-**Project:** {project_title}
-**Generated:** {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-**Teams:** {", ".join(teams)}
+## 📋 Project Overview
 
-## 🎯 Development Objectives
+**Generated on:** {generated_at}
+**Teams Involved:** {", ".join(teams)}
+**Status:** Active Development
 
-"""
+---
 
-    # Extract project goals from messages
+## 🎯 Project Goals & Requirements
+
+"""]
+
+    # Extract user/project description from first message
     if messages and messages[0]['role'] == 'user':
-        prompt_content += f"{messages[0]['content']}\n\n"
+        parts.append(f"{messages[0]['content']}\n\n")
 
-    prompt_content += """## 🛠️ Technology Stack & Best Practices
+    parts.append("## 👥 Team Analysis & Recommendations\n\n")
+
+    # Group messages by team
+    team_contributions = defaultdict(list)
+    for msg in islice(messages, 1, None):  # Skip the initial user message
+        if msg.get('model'):
+            team_contributions[msg['model']].append(msg['content'])
+
+    # Add team-specific sections
+    for team, contributions in team_contributions.items():
+        parts.append(f"### 🔧 {team} Analysis\n\n")
+        for i, contribution in enumerate(contributions, 1):
+            parts.append(f"#### Contribution {i}\n{contribution}\n\n")
+
+    parts.append(_GUIDELINES_MD)
+
+    return "".join(parts)
+
+def generate_project_md_file(messages, project_title, teams, generated_at=None):
+    """Generate a comprehensive MD file with project specifications and guidelines"""
+    return _stamp_generated_at(_project_md_template(messages, project_title, teams), generated_at)
+
+_CURSOR_PRACTICES_MD = """## 🛠️ Technology Stack & Best Practices
 
 ### Frontend Development
 ```javascript
@@ -1059,9 +1040,8 @@ def generate_cursor_prompt_file(messages, project_title, teams):
 
 """
 
-    # Add team-specific guidelines based on the discussion
-    team_guidelines = {
-        "Frontend Dev": """
+_TEAM_GUIDELINES = {
+    "Frontend Dev": """
 ### 🎨 Frontend Guidelines
 - Prioritize user experience and accessibility
 - Use semantic HTML and ARIA attributes
@@ -1069,7 +1049,7 @@ def generate_cursor_prompt_file(messages, project_title, teams):
 - Optimize for Core Web Vitals metrics
 - Use modern CSS features and animations judiciously""",
 
-        "Backend Dev": """
+    "Backend Dev": """
 ### ⚙️ Backend Guidelines
 - Implement proper API versioning
 - Use middleware for cross-cutting concerns
@@ -1077,7 +1057,7 @@ def generate_cursor_prompt_file(messages, project_title, teams):
 - Use connection pooling for database operations
 - Implement proper logging and monitoring""",
 
-        "Database Expert": """
+    "Database Expert": """
 ### 🗄️ Database Guidelines
 - Design normalized database schemas
 - Implement proper indexing strategies
@@ -1085,7 +1065,7 @@ def generate_cursor_prompt_file(messages, project_title, teams):
 - Implement database connection pooling
 - Regular database maintenance and optimization""",
 
-        "Security Specialist": """
+    "Security Specialist": """
 ### 🔒 Security Guidelines
 - Implement input validation and sanitization
 - Use parameterized queries to prevent SQL injection
@@ -1093,7 +1073,7 @@ def generate_cursor_prompt_file(messages, project_title, teams):
 - Regular security audits and penetration testing
 - Keep dependencies updated and monitor vulnerabilities""",
 
-        "AI Engineer": """
+    "AI Engineer": """
 ### 🤖 AI/ML Guidelines
 - Implement proper data preprocessing pipelines
 - Use version control for ML models
@@ -1101,20 +1081,19 @@ def generate_cursor_prompt_file(messages, project_title, teams):
 - Monitor model performance and drift
 - Document model decisions and limitations""",
 
-        "Project Manager": """
+    "Project Manager": """
 ### 📊 Project Management Guidelines
 - Maintain clear project documentation
 - Regular progress updates and status reports
 - Risk assessment and mitigation planning
 - Stakeholder communication and management
 - Quality assurance and testing coordination"""
-    }
+}
 
-    for team in teams:
-        if team in team_guidelines:
-            prompt_content += team_guidelines[team] + "\n\n"
+# Guideline sections exactly as they appear in the prompt file, separator included
+_TEAM_GUIDELINE_SECTIONS = {team: guideline + "\n\n" for team, guideline in _TEAM_GUIDELINES.items()}
 
-    prompt_content += """## 🚀 Deployment & Production
+_CURSOR_DEPLOYMENT_MD = """## 🚀 Deployment & Production
 
 ### Environment Setup
 ```bash
@@ -1181,47 +1160,7 @@ async function authenticateUser(username, password) {
 *This prompt file was generated by AI Discussion Manager to guide Cursor IDE development*
 """
 
-    return prompt_content
-
-def generate_manager_summary(messages, project_title, teams):
-    """Generate a comprehensive project manager summary"""
-    summary_content = f"""# 📊 Project Manager Summary: {project_title}
-
-## 📅 Executive Summary
-
-**Project:** {project_title}
-**Date:** {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-**Status:** Analysis Complete
-**Team Size:** {len(teams)} specialists
-
----
-
-## 🎯 Project Objectives & Scope
-
-"""
-
-    # Extract project objectives from initial message
-    if messages and messages[0]['role'] == 'user':
-        summary_content += f"{messages[0]['content']}\n\n"
-
-    summary_content += "## 👥 Team Contributions Overview\n\n"
-
-    # Analyze team contributions
-    team_stats = {}
-    for msg in messages[1:]:
-        if msg.get('model'):
-            team = msg['model']
-            if team not in team_stats:
-                team_stats[team] = {'count': 0, 'total_chars': 0}
-            team_stats[team]['count'] += 1
-            team_stats[team]['total_chars'] += len(msg['content'])
-
-    for team, stats in team_stats.items():
-        summary_content += f"### {team}\n"
-        summary_content += f"- **Contributions:** {stats['count']} responses\n"
-        summary_content += f"- **Content Volume:** {stats['total_chars']} characters\n\n"
-
-    summary_content += """## 🔍 Key Findings & Recommendations
+_MANAGER_FINDINGS_MD = """## 🔍 Key Findings & Recommendations
 
 ### ✅ Strengths Identified
 - Comprehensive technical analysis across all domains
@@ -1272,10 +1211,7 @@ def generate_manager_summary(messages, project_title, teams):
 ### Team Composition
 """
 
-    for team in teams:
-        summary_content += f"- [ ] {team}\n"
-
-    summary_content += """
+_MANAGER_INFRASTRUCTURE_MD = """
 
 ### Infrastructure Needs
 - [ ] Development servers and environments
@@ -1342,38 +1278,141 @@ def generate_manager_summary(messages, project_title, teams):
 *This summary was generated by AI Discussion Manager for comprehensive project oversight and coordination.*
 """
 
-    return summary_content
+@st.cache_data(max_entries=32, show_spinner=False)
+def _cursor_prompt_template(messages, project_title, teams):
+    """Cursor IDE prompt file, with a placeholder where its timestamp goes"""
+    generated_at = _GENERATED_AT_PLACEHOLDER
+    parts = [f"""# Cursor IDE Development Guidelines for {project_title}
+
+## 📋 Project Context
+
+**Project:** {project_title}
+**Generated:** {generated_at}
+**Teams:** {", ".join(teams)}
+
+## 🎯 Development Objectives
+
+"""]
+
+    # Extract project goals from messages
+    if messages and messages[0]['role'] == 'user':
+        parts.append(f"{messages[0]['content']}\n\n")
+
+    parts.append(_CURSOR_PRACTICES_MD)
+
+    # Add team-specific guidelines based on the discussion
+    parts.extend(_TEAM_GUIDELINE_SECTIONS[team] for team in teams if team in _TEAM_GUIDELINE_SECTIONS)
+
+    parts.append(_CURSOR_DEPLOYMENT_MD)
+
+    return "".join(parts)
+
+def generate_cursor_prompt_file(messages, project_title, teams, generated_at=None):
+    """Generate a comprehensive prompt file for Cursor IDE development"""
+    return _stamp_generated_at(_cursor_prompt_template(messages, project_title, teams), generated_at)
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _manager_summary_template(messages, project_title, teams):
+    """Project manager summary, with a placeholder where its timestamp goes"""
+    generated_at = _GENERATED_AT_PLACEHOLDER
+    parts = [f"""# 📊 Project Manager Summary: {project_title}
+
+## 📅 Executive Summary
+
+**Project:** {project_title}
+**Date:** {generated_at}
+**Status:** Analysis Complete
+**Team Size:** {len(teams)} specialists
+
+---
+
+## 🎯 Project Objectives & Scope
+
+"""]
+
+    # Extract project objectives from initial message
+    if messages and messages[0]['role'] == 'user':
+        parts.append(f"{messages[0]['content']}\n\n")
+
+    parts.append("## 👥 Team Contributions Overview\n\n")
+
+    # Analyze team contributions
+    counts = Counter()
+    chars = Counter()
+    for msg in islice(messages, 1, None):
+        team = msg.get('model')
+        if team:
+            counts[team] += 1
+            chars[team] += len(msg['content'])
+
+    for team, count in counts.items():
+        parts.append(f"### {team}\n")
+        parts.append(f"- **Contributions:** {count} responses\n")
+        parts.append(f"- **Content Volume:** {chars[team]} characters\n\n")
+
+    parts.append(_MANAGER_FINDINGS_MD)
+
+    for team in teams:
+        parts.append(f"- [ ] {team}\n")
+
+    parts.append(_MANAGER_INFRASTRUCTURE_MD)
+
+    return "".join(parts)
+
+def generate_manager_summary(messages, project_title, teams, generated_at=None):
+    """Generate a comprehensive project manager summary"""
+    return _stamp_generated_at(_manager_summary_template(messages, project_title, teams), generated_at)
+
+def with_file_stats(file_type, file_name, file_content):
+    """Attach (size, lines) to a generated file so the stats column need not rescan it on every rerun"""
+    return file_type, file_name, file_content, (len(file_content), file_content.count('\n') + 1)
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def build_files_zip(files):
+    """Bundle (file_name, file_content) pairs into an in-memory ZIP archive"""
+    # Favour speed over ratio once the bundle gets large
+    total_size = sum(len(content) for _, content in files)
+    compresslevel = 1 if total_size > 10 * 1024 * 1024 else 6
+
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED, compresslevel=compresslevel) as zip_file:
+        for file_name, file_content in files:
+            zip_file.writestr(file_name, file_content)
+    return buffer.getvalue()
 
 def generate_all_files(messages, project_title, teams):
     """Generate all documentation files and save to database"""
     if not st.session_state.conversation_id:
         return False, "No active conversation to generate files for"
 
-    files_generated = []
+    # Nothing changed since the last generation for this conversation: keep those files
+    # rather than generating and inserting an identical set again
+    inputs_digest = hashlib.sha256(
+        repr((project_title, list(teams), [(msg['role'], msg['content'], msg.get('model')) for msg in messages])).encode('utf-8')
+    ).hexdigest()
+    generation_key = (st.session_state.conversation_id, inputs_digest)
+    if st.session_state.generated_files and st.session_state.get('generation_key') == generation_key:
+        return True, f"✅ {len(st.session_state.generated_files)} documentation files are already up to date!"
 
     try:
-        # Generate MD project specification file
-        md_content = generate_project_md_file(messages, project_title, teams)
-        md_filename = f"{project_title.replace(' ', '_')}_Specification.md"
-        if save_generated_file_to_db(st.session_state.conversation_id, 'markdown', md_filename, md_content):
-            files_generated.append(('markdown', md_filename, md_content))
-
-        # Generate Cursor IDE prompt file
-        cursor_content = generate_cursor_prompt_file(messages, project_title, teams)
-        cursor_filename = f"{project_title.replace(' ', '_')}_Cursor_Prompts.md"
-        if save_generated_file_to_db(st.session_state.conversation_id, 'cursor_guide', cursor_filename, cursor_content):
-            files_generated.append(('cursor_guide', cursor_filename, cursor_content))
-
-        # Generate Manager Summary
-        manager_content = generate_manager_summary(messages, project_title, teams)
-        manager_filename = f"{project_title.replace(' ', '_')}_Manager_Summary.md"
-        if save_generated_file_to_db(st.session_state.conversation_id, 'markdown', manager_filename, manager_content):
-            files_generated.append(('markdown', manager_filename, manager_content))
+        base_name = project_title.replace(' ', '_')
+        # One timestamp for the whole set, stamped onto each document after its cache lookup
+        generated_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        files = [
+            ('markdown', f"{base_name}_Specification.md", generate_project_md_file(messages, project_title, teams, generated_at)),
+            ('cursor_guide', f"{base_name}_Cursor_Prompts.md", generate_cursor_prompt_file(messages, project_title, teams, generated_at)),
+            ('markdown', f"{base_name}_Manager_Summary.md", generate_manager_summary(messages, project_title, teams, generated_at)),
+        ]
+
+        # Save all three files in a single insert
+        if not save_turn_to_db(st.session_state.conversation_id, generated_files_rows=files):
+            return False, "❌ Documentation files were generated but could not be saved to the database"
 
         # Update session state with generated files
-        st.session_state.generated_files = files_generated
+        st.session_state.generated_files = [with_file_stats(*file) for file in files]
+        st.session_state.generation_key = generation_key
 
-        return True, f"✅ Successfully generated {len(files_generated)} documentation files!"
+        return True, f"✅ Successfully generated {len(files)} documentation files!"
 
     except Exception as e:
         return False, f"❌ Error generating files: {str(e)}"
@@ -1410,7 +1449,7 @@ def render_api_verification_section():
                     verified, message = verify_openai_api_key(openai_key)
                     if verified:
                         st.success(message)
-                        st.session_state.openai_client = openai.OpenAI(api_key=openai_key)
+                        st.session_state.openai_client = _get_openai_client(openai_key)
                         st.session_state.openai_verified = True
                     else:
                         st.error(message)
@@ -1438,7 +1477,7 @@ def render_api_verification_section():
                     verified, message = verify_supabase_credentials(supabase_url, supabase_key)
                     if verified:
                         st.success(message)
-                        st.session_state.supabase_client = create_client(supabase_url, supabase_key)
+                        st.session_state.supabase_client = _get_supabase_client(supabase_url, supabase_key)
                         st.session_state.supabase_verified = True
                     else:
                         st.error(message)
@@ -1465,7 +1504,7 @@ def render_navigation():
     for label, page, col in pages:
         with col:
             # Use unique keys and handle navigation
-            button_key = f"nav_{page}_{hash(label)}"
+            button_key = f"nav_{page}"
             is_current_page = st.session_state.current_page == page
 
             if st.button(label, key=button_key, type="primary" if is_current_page else "secondary"):
@@ -1479,7 +1518,10 @@ def render_file_upload_section():
     st.markdown('<div class="modern-card">', unsafe_allow_html=True)
     st.markdown("### 📁 File & Folder Analysis")
 
-    tab1, tab2, tab3 = st.tabs(["📄 Single Files", "📂 Folder Upload", "🔗 URL Import"])
+    tab_labels = ["📄 Single Files", "📂 Folder Upload"]
+    if ENABLE_GITHUB_IMPORT:
+        tab_labels.append("🔗 URL Import")
+    tab1, tab2, *url_tab = st.tabs(tab_labels)
 
     with tab1:
         uploaded_files = st.file_uploader(
@@ -1503,26 +1545,24 @@ def render_file_upload_section():
                 analyze_zip_folder(uploaded_zip)
         st.markdown('</div>', unsafe_allow_html=True)
 
-    with tab3:
-        repo_url = st.text_input("GitHub Repository URL", placeholder="https://github.com/user/repo")
-        if repo_url and st.button("📥 Clone & Analyze", key="analyze_repo"):
-            with st.spinner("Cloning and analyzing repository..."):
-                analyze_github_repo(repo_url)
+    if url_tab:
+        with url_tab[0]:
+            repo_url = st.text_input("GitHub Repository URL", placeholder="https://github.com/user/repo")
+            if repo_url and st.button("📥 Clone & Analyze", key="analyze_repo"):
+                with st.spinner("Cloning and analyzing repository..."):
+                    analyze_github_repo(repo_url)
 
     st.markdown('</div>', unsafe_allow_html=True)
 
 def analyze_zip_folder(zip_file):
     """Analyze ZIP folder structure"""
     try:
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with zipfile.ZipFile(zip_file, 'r') as zip_ref:
-                zip_ref.extractall(temp_dir)
-
-            # Analyze the extracted folder
-            structure = analyze_folder_structure(temp_dir)
+        # Names and sizes come from the archive's directory, so nothing is extracted
+        with zipfile.ZipFile(zip_file, 'r') as zip_ref:
+            structure = analyze_zip_structure(zip_ref)
 
-            st.success("✅ Folder extracted and analyzed!")
-            display_folder_analysis(structure)
+        st.success("✅ ZIP folder analyzed!")
+        display_folder_analysis(structure)
 
     except Exception as e:
         st.error(f"❌ Error analyzing ZIP folder: {str(e)}")
@@ -1532,43 +1572,24 @@ def analyze_github_repo(repo_url):
     st.info("🚧 GitHub repository analysis coming soon!")
     # TODO: Implement GitHub API integration for repository analysis
 
+def render_metric_cards(cards):
+    """Render (title, value) metric cards side by side in a single markdown element"""
+    card_html = "".join(
+        f'<div class="analysis-card"><h4>{title}</h4><div class="metric">{value}</div></div>'
+        for title, value in cards
+    )
+    st.markdown(f'<div class="metric-row">{card_html}</div>', unsafe_allow_html=True)
+
 def display_folder_analysis(structure):
     """Display folder structure analysis"""
     st.markdown("### 📂 Folder Analysis Results")
 
-    col1, col2, col3, col4 = st.columns(4)
-
-    with col1:
-        st.markdown(f"""
-        <div class="analysis-card">
-            <h4>📁 Total Files</h4>
-            <div class="metric">{structure['total_files']}</div>
-        </div>
-        """, unsafe_allow_html=True)
-
-    with col2:
-        st.markdown(f"""
-        <div class="analysis-card">
-            <h4>🗂️ Folders</h4>
-            <div class="metric">{len(structure['folders'])}</div>
-        </div>
-        """, unsafe_allow_html=True)
-
-    with col3:
-        st.markdown(f"""
-        <div class="analysis-card">
-            <h4>🗣️ Languages</h4>
-            <div class="metric">{len(structure['languages'])}</div>
-        </div>
-        """, unsafe_allow_html=True)
-
-    with col4:
-        st.markdown(f"""
-        <div class="analysis-card">
-            <h4>📋 Types</h4>
-            <div class="metric">{len(structure['file_types'])}</div>
-        </div>
-        """, unsafe_allow_html=True)
+    render_metric_cards([
+        ("📁 Total Files", structure['total_files']),
+        ("🗂️ Folders", len(structure['folders'])),
+        ("🗣️ Languages", len(structure['languages'])),
+        ("📋 Types", len(structure['file_types']))
+    ])
 
     # Language breakdown
     if structure['languages']:
@@ -1590,19 +1611,34 @@ def display_folder_analysis(structure):
 def analyze_uploaded_files(files):
     """Analyze uploaded files"""
     results = {}
+    skipped = []
     progress_bar = st.progress(0)
 
     for i, file in enumerate(files):
-        file_content = file.read().decode('utf-8')
+        raw = file.read()
         file_path = file.name
 
+        # A NUL byte near the start means a binary file; there is nothing to analyze
+        if b'\0' in raw[:_SNIFF_WINDOW]:
+            skipped.append(file_path)
+            progress_bar.progress((i + 1) / len(files))
+            continue
+
+        # Only analyze the start of very large files; the cut may split a character
+        truncated = len(raw) > MAX_ANALYZE_BYTES
+        file_content = raw[:MAX_ANALYZE_BYTES].decode('utf-8', errors='ignore' if truncated else 'strict')
+
         # Analyze the file
         analysis = analyze_code_file(file_path, file_content)
+        analysis["truncated"] = truncated
         results[file_path] = analysis
 
         # Update progress
         progress_bar.progress((i + 1) / len(files))
 
+    if skipped:
+        st.warning(f"⚠️ Skipped binary files: {', '.join(skipped)}")
+
     st.session_state.analysis_results = results
     display_analysis_results(results)
 
@@ -1613,49 +1649,23 @@ def display_analysis_results(results):
 
     st.markdown("### 📊 Analysis Results")
 
-    # Summary metrics
+    # Summary metrics, gathered in a single pass over the results
     total_files = len(results)
-    languages = {}
+    languages = Counter()
     total_lines = 0
+    total_functions = 0
 
-    for file_path, analysis in results.items():
-        lang = analysis['language']
-        languages[lang] = languages.get(lang, 0) + 1
+    for analysis in results.values():
+        languages[analysis['language']] += 1
         total_lines += analysis['lines']
+        total_functions += len(analysis.get('functions', ()))
 
-    col1, col2, col3, col4 = st.columns(4)
-
-    with col1:
-        st.markdown(f"""
-        <div class="analysis-card">
-            <h4>📄 Files</h4>
-            <div class="metric">{total_files}</div>
-        </div>
-        """, unsafe_allow_html=True)
-
-    with col2:
-        st.markdown(f"""
-        <div class="analysis-card">
-            <h4>📝 Lines</h4>
-            <div class="metric">{total_lines:,}</div>
-        </div>
-        """, unsafe_allow_html=True)
-
-    with col3:
-        st.markdown(f"""
-        <div class="analysis-card">
-            <h4>🗣️ Languages</h4>
-            <div class="metric">{len(languages)}</div>
-        </div>
-        """, unsafe_allow_html=True)
-
-    with col4:
-        st.markdown(f"""
-        <div class="analysis-card">
-            <h4>🔧 Functions</h4>
-            <div class="metric">{sum(len(a.get('functions', [])) for a in results.values())}</div>
-        </div>
-        """, unsafe_allow_html=True)
+    render_metric_cards([
+        ("📄 Files", total_files),
+        ("📝 Lines", f"{total_lines:,}"),
+        ("🗣️ Languages", len(languages)),
+        ("🔧 Functions", total_functions)
+    ])
 
     # Detailed file analysis
     for file_path, analysis in results.items():
@@ -1675,6 +1685,9 @@ def display_analysis_results(results):
             with col3:
                 st.metric("Characters", f"{analysis['characters']:,}")
 
+            if analysis.get('truncated'):
+                st.caption(f"Only the first {MAX_ANALYZE_BYTES // (1024 * 1024)} MB of this file were analyzed.")
+
             # Suggestions
             if analysis.get('suggestions'):
                 st.markdown("#### 💡 Suggestions")
@@ -1772,95 +1785,177 @@ def render_settings_page():
         st.session_state.supabase_verified = False
         st.success("API verification reset. Please re-verify your credentials.")
 
-# Run the main application
-if __name__ == "__main__":
-    main()
+def render_sidebar():
+    """Render the configuration sidebar and return (max_rounds, discussion_style)"""
+    with st.sidebar:
+        st.header("🔧 Configuration")
+
+        # OpenAI Initialization
+        if st.button("🔗 Initialize OpenAI"):
+            with st.spinner("Connecting to OpenAI..."):
+                success, msg = initialize_openai(verify=True)
+                if success:
+                    st.success(msg)
+                else:
+                    st.error(msg)
 
-# Sidebar configuration
-with st.sidebar:
-    st.header("🔧 Configuration")
-
-    # OpenAI Initialization
-    if st.button("🔗 Initialize OpenAI"):
-        with st.spinner("Connecting to OpenAI..."):
-            success, msg = initialize_openai()
-            if success:
-                st.success(msg)
-            else:
-                st.error(msg)
+        if st.session_state.openai_client:
+            st.success("✅ OpenAI Connected")
+        else:
+            st.warning("⚠️ Not connected")
+
+        st.divider()
+
+        # Teams
+        st.subheader("👨‍💻 Select Teams (max 7)")
+        available_teams = ["Frontend Dev", "Backend Dev", "Database Expert", "Security Specialist", "AI Engineer", "Project Manager", "DevOps Engineer"]
+        selected = st.multiselect("Choose teams:", available_teams, max_selections=7)
+
+        if selected:
+            st.session_state.teams = selected
+
+        st.divider()
+
+        # Conversation History
+        st.subheader("📚 History")
+        col_load, col_refresh = st.columns(2)
+        with col_load:
+            load_clicked = st.button("🔄 Load History")
+        with col_refresh:
+            refresh_clicked = st.button("♻️ Refresh", help="Reload the list from the database instead of the cache")
+        if load_clicked or refresh_clicked:
+            with st.spinner("Loading conversation history..."):
+                history = load_conversation_history(refresh=refresh_clicked)
+                if history:
+                    st.session_state.conversation_history = history
+                    st.success(f"✅ Loaded {len(history)} conversations")
+                else:
+                    st.info("No conversation history found")
+
+        # Display conversation history
+        if 'conversation_history' in st.session_state and st.session_state.conversation_history:
+            st.markdown("**Recent Conversations:**")
+            for conv in st.session_state.conversation_history:  # Newest first
+                title = conv.get('project_title', f"Conversation {conv.get('id', 'Unknown')}")
+                # PostgREST returns created_at as an ISO string, e.g. 2024-05-01T12:34:56.789+00:00
+                created_date = conv['created_at'][:16].replace('T', ' ') if conv.get('created_at') else 'Unknown'
+
+                if st.button(f"📄 {title[:30]}... ({created_date})", key=f"hist_{conv.get('id')}"):
+                    # Load this conversation, after saving anything still queued for the current one
+                    flush_pending_messages(st.session_state.conversation_id)
+                    full_conv = load_conversation_from_db(conv.get('session_id'))
+                    if full_conv:
+                        st.session_state.messages = [
+                            {'role': msg['role'], 'content': msg['content'], 'model': msg.get('model')}
+                            for msg in full_conv['messages']
+                        ]
+                        reset_discussion_tracking(st.session_state.messages)
+                        st.session_state.generated_files = [
+                            with_file_stats(file['file_type'], file['file_name'], file['file_content'])
+                            for file in full_conv['files']
+                        ]
+                        st.session_state.conversation_id = conv.get('id')
+                        st.success(f"✅ Loaded conversation: {title}")
+                    else:
+                        st.error("Failed to load conversation details")
 
-    if st.session_state.openai_client:
-        st.success("✅ OpenAI Connected")
-    else:
-        st.warning("⚠️ Not connected")
+        st.divider()
 
-    st.divider()
+        # Discussion Settings
+        st.subheader("Discussion Settings")
+        max_rounds = st.slider("Max Discussion Rounds", 1, 10, 5)
+        discussion_style = st.selectbox(
+            "Discussion Style",
+            ["Collaborative", "Debate", "Technical Review", "Creative Brainstorm"]
+        )
 
-    # Teams
-    st.subheader("👨‍💻 Select Teams (max 7)")
-    available_teams = ["Frontend Dev", "Backend Dev", "Database Expert", "Security Specialist", "AI Engineer", "Project Manager", "DevOps Engineer"]
-    selected = st.multiselect("Choose teams:", available_teams, max_selections=7)
+        # Clear chat
+        if st.button("🗑️ Clear Discussion"):
+            reset_discussion()
+            st.rerun()
 
-    if selected:
-        st.session_state.teams = selected
+    return max_rounds, discussion_style
 
-    st.divider()
+@st.fragment
+def render_discussion(max_rounds, discussion_style):
+    """Show the conversation and run the next team's turn, rerunning only this part between turns"""
+    # Show messages
+    display_conversation()
 
-    # Conversation History
-    st.subheader("📚 History")
-    if st.button("🔄 Load History"):
-        with st.spinner("Loading conversation history..."):
-            history = load_conversation_history()
-            if history:
-                st.session_state.conversation_history = history
-                st.success(f"✅ Loaded {len(history)} conversations")
-            else:
-                st.info("No conversation history found")
-
-    # Display conversation history
-    if 'conversation_history' in st.session_state and st.session_state.conversation_history:
-        st.markdown("**Recent Conversations:**")
-        for conv in st.session_state.conversation_history[-5:]:  # Show last 5
-            title = conv.get('project_title', f"Conversation {conv.get('id', 'Unknown')}")
-            created_date = conv.get('created_at', 'Unknown').strftime('%Y-%m-%d %H:%M') if conv.get('created_at') else 'Unknown'
-
-            if st.button(f"📄 {title[:30]}... ({created_date})", key=f"hist_{conv.get('id')}_{hash(title)}"):
-                # Load this conversation
-                full_conv = load_conversation_from_db(conv.get('session_id'))
-                if full_conv:
-                    st.session_state.messages = [
-                        {'role': msg['role'], 'content': msg['content'], 'model': msg.get('model')}
-                        for msg in full_conv['messages']
-                    ]
-                    st.session_state.generated_files = [
-                        (file['file_type'], file['file_name'], file['file_content'])
-                        for file in full_conv['files']
-                    ]
-                    st.session_state.conversation_id = conv.get('id')
-                    st.success(f"✅ Loaded conversation: {title}")
-                    st.rerun()
-                else:
-                    st.error("Failed to load conversation details")
+    # Auto discussion
+    if st.session_state.discussion_active and st.session_state.teams and st.session_state.messages:
+        teams = st.session_state.teams
+        n_teams = len(teams)
+        target = max_rounds * n_teams
+        ai_count = st.session_state.ai_message_count
+        if ai_count < target:
+            team_index = ai_count % n_teams
+            next_team = teams[team_index]
 
-    st.divider()
+            # Context is kept up to date by add_message()
+            context = st.session_state.discussion_context
 
-    # Discussion Settings
-    st.subheader("Discussion Settings")
-    max_rounds = st.slider("Max Discussion Rounds", 1, 10, 5)
-    discussion_style = st.selectbox(
-        "Discussion Style",
-        ["Collaborative", "Debate", "Technical Review", "Creative Brainstorm"]
-    )
+            # Determine if this is file-based content
+            is_file_content = bool(st.session_state.uploaded_file_content_gz)
+
+            # Base system prompt for the team, plus the discussion style context
+            system_prompt = build_team_prompt(next_team, discussion_style, is_file_content)
+
+            with st.spinner(f"🟢 {next_team} is thinking..."):
+                # Show the reply as it streams in, laid out like display_conversation()
+                with st.chat_message("assistant", avatar="🟢"):
+                    st.write(f"**{next_team}** - {datetime.now().strftime('%H:%M:%S')}")
+                    response = st.write_stream(call_openai_stream(context, system_prompt)) or ""
+                add_message("assistant", response, next_team)
+
+                # Save AI responses to database once per round, in a single insert
+                queue_message_for_db("assistant", response, next_team)
+                last_turn = ai_count + 1 >= target
+                if last_turn or (ai_count + 1) % n_teams == 0:
+                    flush_pending_messages(st.session_state.conversation_id)
+
+                # Between turns only this fragment needs to redraw; the last turn
+                # refreshes the whole page so the stats and status catch up
+                st.rerun(scope="app" if last_turn else "fragment")
+        else:
+            st.success("🎉 Discussion completed!")
+
+            # Generate Documentation Files
+            st.subheader("📄 Generate Documentation")
+
+            col_gen1, col_gen2 = st.columns([1, 1])
+            with col_gen1:
+                if st.button("📝 Generate All Files", type="primary"):
+                    project_title = st.session_state.messages[0]['content'].split('\n')[0] if st.session_state.messages else "AI_Project"
+                    success, message = generate_all_files(st.session_state.messages, project_title, st.session_state.teams)
+                    if success:
+                        st.success(message)
+                    else:
+                        st.error(message)
+                    # The files list lives in the stats column, outside this fragment
+                    st.rerun(scope="app")
 
-    # Clear chat
-    if st.button("🗑️ Clear Discussion"):
-        st.session_state.messages = []
-        st.session_state.discussion_active = False
-        st.session_state.uploaded_file_content = ""
-        st.session_state.uploaded_file_name = ""
-        st.session_state.conversation_id = None
-        st.session_state.generated_files = []
-        st.rerun()
+            with col_gen2:
+                if st.button("📊 Generate Manager Summary Only"):
+                    project_title = st.session_state.messages[0]['content'].split('\n')[0] if st.session_state.messages else "AI_Project"
+                    if st.session_state.conversation_id:
+                        manager_content = generate_manager_summary(st.session_state.messages, project_title, st.session_state.teams)
+                        manager_filename = f"{project_title.replace(' ', '_')}_Manager_Summary.md"
+                        if save_generated_file_to_db(st.session_state.conversation_id, 'markdown', manager_filename, manager_content):
+                            st.success("✅ Manager Summary generated successfully!")
+                        else:
+                            st.error("❌ Failed to generate Manager Summary")
+                    else:
+                        st.error("No active conversation found")
+
+            st.session_state.discussion_active = False
+
+# Run the main application
+if __name__ == "__main__":
+    main()
+
+# Sidebar configuration
+max_rounds, discussion_style = render_sidebar()
 
 # Main content area
 col1, col2 = st.columns([2, 1])
@@ -1880,37 +1975,43 @@ with col1:
 
         project_content = ""
         project_title = ""
+        word_limit_valid = True
 
         if input_method == "📝 Manual Input":
-            # Manual text input with word limits
-            col1, col2 = st.columns([2, 1])
+            # A form so editing the text does not rerun the app until the discussion is started
+            with st.form("project_form", clear_on_submit=False):
+                # Manual text input with word limits
+                # Own names so the page-level col1/col2 stay intact for the stats column
+                topic_col, topic_count_col = st.columns([2, 1])
 
-            with col1:
-                topic = st.text_area("Describe your project:", height=100, max_chars=1500, help="Maximum 150 words (approximately 1500 characters)")
+                with topic_col:
+                    topic = st.text_area("Describe your project:", height=100, max_chars=1500, help="Maximum 150 words (approximately 1500 characters)")
 
-            with col2:
-                topic_word_count = len(topic.split()) if topic else 0
-                st.metric("Topic Words", f"{topic_word_count}/150")
-                if topic_word_count > 150:
-                    st.error("⚠️ Topic exceeds 150 word limit!")
+                with topic_count_col:
+                    topic_word_count = len(topic.split()) if topic else 0
+                    st.metric("Topic Words", f"{topic_word_count}/150")
+                    if topic_word_count > 150:
+                        st.error("⚠️ Topic exceeds 150 word limit!")
+
+                goals = st.text_area("Goals & Features:", height=100, max_chars=1500, help="Maximum 150 words (approximately 1500 characters)")
+                goals_word_count = len(goals.split()) if goals else 0
 
-            goals = st.text_area("Goals & Features:", height=100, max_chars=1500, help="Maximum 150 words (approximately 1500 characters)")
-            goals_word_count = len(goals.split()) if goals else 0
+                _, goals_count_col = st.columns([2, 1])
+                with goals_count_col:
+                    st.metric("Goals Words", f"{goals_word_count}/150")
+                    if goals_word_count > 150:
+                        st.error("⚠️ Goals exceed 150 word limit!")
 
-            col3, col4 = st.columns([2, 1])
-            with col4:
-                st.metric("Goals Words", f"{goals_word_count}/150")
-                if goals_word_count > 150:
-                    st.error("⚠️ Goals exceed 150 word limit!")
+                # Validate word limits
+                word_limit_valid = topic_word_count <= 150 and goals_word_count <= 150
 
-            # Validate word limits
-            word_limit_valid = topic_word_count <= 150 and goals_word_count <= 150
+                if topic and goals and word_limit_valid:
+                    project_content = f"Topic: {topic}\n\nGoals: {goals}"
+                    project_title = "Manual Project Description"
+                elif not word_limit_valid:
+                    st.error("❌ Please reduce content to stay within 150 word limits.")
 
-            if topic and goals and word_limit_valid:
-                project_content = f"Topic: {topic}\n\nGoals: {goals}"
-                project_title = "Manual Project Description"
-            elif not word_limit_valid:
-                st.error("❌ Please reduce content to stay within 150 word limits.")
+                start_clicked = st.form_submit_button("🚀 Start Discussion", type="primary")
 
         else:  # File Upload
             st.markdown("**Upload your project documentation (.md or .txt):**")
@@ -1925,32 +2026,30 @@ with col1:
                     success, message = process_uploaded_file(uploaded_file)
                     if success:
                         st.success(message)
-                        st.rerun()
                     else:
                         st.error(message)
 
             # Display uploaded file content if available
-            if st.session_state.uploaded_file_content:
+            if st.session_state.uploaded_file_content_gz:
+                uploaded_content = get_uploaded_file_content()
                 st.success(f"📄 **{st.session_state.uploaded_file_name}** loaded successfully!")
                 with st.expander("📋 Preview File Content", expanded=False):
-                    st.code(st.session_state.uploaded_file_content[:1000] + ("..." if len(st.session_state.uploaded_file_content) > 1000 else ""), language="markdown")
+                    st.code(uploaded_content[:1000] + ("..." if len(uploaded_content) > 1000 else ""), language="markdown")
 
-                project_content = f"File: {st.session_state.uploaded_file_name}\n\nContent:\n{st.session_state.uploaded_file_content}"
+                project_content = f"File: {st.session_state.uploaded_file_name}\n\nContent:\n{uploaded_content}"
                 project_title = f"Analysis of {st.session_state.uploaded_file_name}"
 
-        # Start discussion button
-        if st.button("🚀 Start Discussion", type="primary"):
+            # Start discussion button
+            start_clicked = st.button("🚀 Start Discussion", type="primary")
+
+        if start_clicked:
             # Validate all requirements
             has_content = bool(project_content.strip()) if project_content else False
             has_openai = bool(st.session_state.openai_client)
             has_teams = bool(st.session_state.teams)
 
-            # Additional validation for manual input
-            word_limit_ok = True
-            if input_method == "📝 Manual Input":
-                topic_words = len((topic or "").split())
-                goals_words = len((goals or "").split())
-                word_limit_ok = topic_words <= 150 and goals_words <= 150
+            # Additional validation for manual input, using the word counts shown above
+            word_limit_ok = word_limit_valid
 
             if has_content and has_openai and has_teams and word_limit_ok:
                 st.session_state.discussion_active = True
@@ -1962,175 +2061,59 @@ with col1:
                     final_project_title,
                     st.session_state.teams,
                     st.session_state.uploaded_file_name if input_method == "📁 Upload File" else None,
-                    st.session_state.uploaded_file_content if input_method == "📁 Upload File" else None
+                    get_uploaded_file_content() if input_method == "📁 Upload File" else None
                 )
 
                 if conversation_id:
                     st.session_state.conversation_id = conversation_id
                     add_message("user", project_content)
 
-                    # Save initial message to database
-                    save_message_to_db(conversation_id, "user", project_content)
+                    # Persist the opening message now so it survives even if
+                    # the session ends before the first reply
+                    queue_message_for_db("user", project_content)
+                    flush_pending_messages(conversation_id)
                 else:
                     st.error("Failed to save conversation to database")
 
                 st.rerun()
             else:
-                error_msg = "Please fix the following issues:\n"
+                error_parts = ["Please fix the following issues:\n"]
                 if not has_content:
-                    error_msg += "• Enter project details or upload a file\n"
+                    error_parts.append("• Enter project details or upload a file\n")
                 if not has_openai:
-                    error_msg += "• Initialize OpenAI connection\n"
+                    error_parts.append("• Initialize OpenAI connection\n")
                 if not has_teams:
-                    error_msg += "• Select at least one team\n"
+                    error_parts.append("• Select at least one team\n")
                 if input_method == "📝 Manual Input" and not word_limit_ok:
-                    error_msg += "• Keep content within 150 word limits\n"
-                st.error(error_msg)
-
-    # Show messages
-    display_conversation()
-
-    # Auto discussion
-    if st.session_state.discussion_active and st.session_state.teams and st.session_state.messages:
-        ai_count = len([m for m in st.session_state.messages if m["model"]])
-        if ai_count < max_rounds * len(st.session_state.teams):
-            last_model = st.session_state.messages[-1].get("model", "")
-            team_index = ai_count % len(st.session_state.teams)
-            next_team = st.session_state.teams[team_index]
-
-            # Build context
-            context = [{"role": "user", "content": st.session_state.messages[0]["content"]}]
-            for msg in st.session_state.messages[1:]:
-                if msg["model"]:
-                    context.append({"role": "assistant", "content": msg["content"]})
-
-            # Determine if this is file-based content
-            is_file_content = bool(st.session_state.uploaded_file_content)
-
-            # Base system prompt for the team
-            team_base_prompts = {
-                "Frontend Dev": f"""You are {next_team}, a frontend development expert specializing in modern web technologies.
-
-{f'Analyze the uploaded documentation and provide frontend-specific insights. Consider UI/UX best practices, responsive design, performance optimization, and integration with backend APIs.' if is_file_content else 'Provide frontend development expertise for the described project.'}
-
-Focus on user experience, accessibility, and modern frontend frameworks like React, Vue, or Angular.""",
-
-                "Backend Dev": f"""You are {next_team}, a backend development expert specializing in server-side technologies.
-
-{f'Analyze the uploaded documentation and provide backend architecture insights. Consider API design, database integration, security, scalability, and microservices architecture.' if is_file_content else 'Provide backend development expertise for the described project.'}
-
-Focus on robust, scalable, and maintainable server-side solutions.""",
-
-                "Database Expert": f"""You are {next_team}, a database and data architecture specialist.
-
-{f'Analyze the uploaded documentation and provide database design insights. Consider data modeling, performance optimization, security, and scalability requirements.' if is_file_content else 'Provide database design expertise for the described project.'}
-
-Focus on efficient data storage, retrieval, and management solutions.""",
+                    error_parts.append("• Keep content within 150 word limits\n")
+                st.error("".join(error_parts))
 
-                "Security Specialist": f"""You are {next_team}, a cybersecurity and application security expert.
-
-{f'Analyze the uploaded documentation and identify security vulnerabilities, risks, and compliance requirements. Provide security best practices and implementation recommendations.' if is_file_content else 'Provide security expertise for the described project.'}
-
-Focus on secure coding practices, authentication, authorization, and data protection.""",
-
-                "AI Engineer": f"""You are {next_team}, an AI/ML engineering specialist.
-
-{f'Analyze the uploaded documentation and identify opportunities for AI/ML integration. Consider machine learning models, data processing pipelines, and AI-powered features.' if is_file_content else 'Provide AI/ML engineering expertise for the described project.'}
-
-Focus on intelligent features, automation, and data-driven solutions.""",
-
-                "Project Manager": f"""You are {next_team}, a project management and coordination specialist overseeing the entire development process.
-
-{f'Analyze the uploaded documentation and provide project management insights. Coordinate between different teams, manage timelines, identify dependencies, and ensure project success.' if is_file_content else 'Provide project management expertise for the described project.'}
-
-Focus on project planning, team coordination, risk management, and delivery milestones.""",
-
-                "DevOps Engineer": f"""You are {next_team}, a DevOps and infrastructure specialist focusing on deployment, automation, and system reliability.
-
-{f'Analyze the uploaded documentation and provide DevOps insights. Consider CI/CD pipelines, containerization, monitoring, scalability, and infrastructure automation.' if is_file_content else 'Provide DevOps engineering expertise for the described project.'}
-
-Focus on deployment automation, infrastructure as code, monitoring, and operational excellence."""
-            }
-
-            # Get the base team prompt
-            system_prompt = team_base_prompts.get(next_team, f"You are {next_team}, an expert in your field. Provide valuable insights for this project.")
-
-            # Add discussion style context
-            if discussion_style == "Collaborative":
-                system_prompt += "\n\nApproach this collaboratively, building on previous suggestions and finding common ground between different perspectives."
-            elif discussion_style == "Debate":
-                system_prompt += "\n\nApproach this as a constructive debate, presenting well-reasoned arguments and considering alternative viewpoints."
-            elif discussion_style == "Technical Review":
-                system_prompt += "\n\nConduct a thorough technical review, focusing on best practices, potential issues, and optimization opportunities."
-            elif discussion_style == "Creative Brainstorm":
-                system_prompt += "\n\nBrainstorm creative and innovative solutions, thinking outside the box while maintaining technical feasibility."
-
-            with st.spinner(f"🟢 {next_team} is thinking..."):
-                response = call_openai(context, system_prompt)
-                add_message("assistant", response, next_team)
-
-                # Save AI response to database
-                if st.session_state.conversation_id:
-                    save_message_to_db(st.session_state.conversation_id, "assistant", response, next_team)
-
-                time.sleep(1)
-                st.rerun()
-        else:
-            st.success("🎉 Discussion completed!")
-
-            # Generate Documentation Files
-            st.subheader("📄 Generate Documentation")
-
-            col_gen1, col_gen2 = st.columns([1, 1])
-            with col_gen1:
-                if st.button("📝 Generate All Files", type="primary"):
-                    project_title = st.session_state.messages[0]['content'].split('\n')[0] if st.session_state.messages else "AI_Project"
-                    success, message = generate_all_files(st.session_state.messages, project_title, st.session_state.teams)
-                    if success:
-                        st.success(message)
-                    else:
-                        st.error(message)
-                    st.rerun()
-
-            with col_gen2:
-                if st.button("📊 Generate Manager Summary Only"):
-                    project_title = st.session_state.messages[0]['content'].split('\n')[0] if st.session_state.messages else "AI_Project"
-                    if st.session_state.conversation_id:
-                        manager_content = generate_manager_summary(st.session_state.messages, project_title, st.session_state.teams)
-                        manager_filename = f"{project_title.replace(' ', '_')}_Manager_Summary.md"
-                        if save_generated_file_to_db(st.session_state.conversation_id, 'markdown', manager_filename, manager_content):
-                            st.success("✅ Manager Summary generated successfully!")
-                            st.rerun()
-                        else:
-                            st.error("❌ Failed to generate Manager Summary")
-                    else:
-                        st.error("No active conversation found")
-
-            st.session_state.discussion_active = False
+    # Show messages and run the discussion
+    render_discussion(max_rounds, discussion_style)
 
 with col2:
     st.header("📊 Stats")
 
     if st.session_state.messages:
-        counts = {team: len([m for m in st.session_state.messages if m["model"] == team]) for team in st.session_state.teams}
+        teams = st.session_state.teams
+        target = max_rounds * len(teams)
+        counts = {team: st.session_state.team_counts.get(team, 0) for team in teams}
         total = sum(counts.values())
 
         for team, c in counts.items():
             st.metric(f"{team} Responses", c)
         st.metric("Total Exchanges", total)
 
-        progress = min(total / (max_rounds * len(st.session_state.teams)), 1.0)
-        st.progress(progress, text=f"{total}/{max_rounds * len(st.session_state.teams)}")
+        progress = min(total / target, 1.0)
+        st.progress(progress, text=f"{total}/{target}")
 
         # Generated Files Section
         if st.session_state.generated_files:
             st.subheader("📁 Generated Files")
 
             # File statistics
-            file_types = {}
-            for file_type, file_name, file_content in st.session_state.generated_files:
-                if file_type not in file_types:
-                    file_types[file_type] = []
+            file_types = defaultdict(list)
+            for file_type, file_name, file_content, _ in st.session_state.generated_files:
                 file_types[file_type].append((file_name, file_content))
 
             col_stats1, col_stats2 = st.columns(2)
@@ -2149,9 +2132,9 @@ with col2:
             # Display files
             files_to_show = st.session_state.generated_files
             if file_type_filter != "All":
-                files_to_show = [(ft, fn, fc) for ft, fn, fc in st.session_state.generated_files if ft == file_type_filter]
+                files_to_show = [file for file in st.session_state.generated_files if file[0] == file_type_filter]
 
-            for file_type, file_name, file_content in files_to_show:
+            for i, (file_type, file_name, file_content, (size, lines)) in enumerate(files_to_show):
                 file_icon = {
                     'markdown': '📄',
                     'cursor_guide': '🎯',
@@ -2164,14 +2147,14 @@ with col2:
                     with col_info1:
                         st.metric("Type", file_type.replace('_', ' ').title())
                     with col_info2:
-                        st.metric("Size", f"{len(file_content)} chars")
+                        st.metric("Size", f"{size} chars")
                     with col_info3:
-                        st.metric("Lines", file_content.count('\n') + 1)
+                        st.metric("Lines", lines)
 
                     # Content preview
                     st.markdown("**Preview:**")
-                    preview_length = min(2000, len(file_content))
-                    st.code(file_content[:preview_length] + ("..." if len(file_content) > preview_length else ""),
+                    preview_length = min(2000, size)
+                    st.code(file_content[:preview_length] + ("..." if size > preview_length else ""),
                            language="markdown")
 
                     # Action buttons
@@ -2182,22 +2165,33 @@ with col2:
                             data=file_content,
                             file_name=file_name,
                             mime="text/markdown",
-                            key=f"download_{file_name}_{hash(file_content)}"
+                            key=f"download_{i}_{file_name}"
                         )
                     with col_btn2:
-                        if st.button("👁️ Full View", key=f"fullview_{file_name}_{hash(file_content[:100])}"):
-                            st.text_area("Full Content:", file_content, height=400, key=f"textarea_{file_name}_{hash(file_content[:100])}")
+                        if st.button("👁️ Full View", key=f"fullview_{i}_{file_name}"):
+                            st.text_area("Full Content:", file_content, height=400, key=f"textarea_{i}_{file_name}")
                     with col_btn3:
-                        if st.button("📋 Copy", key=f"copy_{file_name}_{hash(file_content[:100])}"):
+                        if st.button("📋 Copy", key=f"copy_{i}_{file_name}"):
                             st.code(file_content, language="markdown")
                             st.success("Content copied to clipboard area above!")
 
             # Bulk download option
             if len(files_to_show) > 1:
                 st.markdown("---")
-                if st.button("📦 Download All Files (ZIP)", key="bulk_download"):
-                    # This would require additional zip functionality
-                    st.info("Bulk download feature coming soon! Please download files individually for now.")
+                # Files loaded from history repeat names across generations; they
+                # are newest first, so keep the first of each name
+                newest = {}
+                for _, file_name, file_content, _ in files_to_show:
+                    newest.setdefault(file_name, file_content)
+                bundle = list(newest.items())
+                zip_name = os.path.commonprefix([file_name for file_name, _ in bundle]).rstrip('_') or "generated_files"
+                st.download_button(
+                    label="📦 Download All Files (ZIP)",
+                    data=build_files_zip(bundle),
+                    file_name=f"{zip_name}.zip",
+                    mime="application/zip",
+                    key="bulk_download"
+                )
 
     else:
         st.info("No discussion started yet")
@@ -2229,9 +2223,10 @@ with col2:
             st.info(f"📄 {st.session_state.uploaded_file_name}")
             if st.button("👁️ Review Uploaded File", key="review_uploaded"):
                 with st.expander("📋 Uploaded File Content", expanded=True):
-                    if st.session_state.uploaded_file_content:
-                        st.code(st.session_state.uploaded_file_content[:2000] +
-                               ("..." if len(st.session_state.uploaded_file_content) > 2000 else ""),
+                    if st.session_state.uploaded_file_content_gz:
+                        uploaded_content = get_uploaded_file_content()
+                        st.code(uploaded_content[:2000] +
+                               ("..." if len(uploaded_content) > 2000 else ""),
                                language="markdown")
                     else:
                         st.warning("No file content available")
@@ -2243,28 +2238,22 @@ with col2:
     with col_action1:
         if st.button("🆕 New Discussion", key="new_discussion"):
             # Clear current session but keep history
-            st.session_state.messages = []
-            st.session_state.discussion_active = False
-            st.session_state.uploaded_file_content = ""
-            st.session_state.uploaded_file_name = ""
-            st.session_state.conversation_id = None
-            st.session_state.generated_files = []
-            import uuid
-            st.session_state.session_id = str(uuid.uuid4())
+            reset_discussion(new_session=True)
             st.success("✅ Started new discussion session!")
             st.rerun()
 
     with col_action2:
         if st.button("💾 Save Current State", key="save_state"):
             if st.session_state.conversation_id and st.session_state.messages:
-                st.success("✅ Current conversation is automatically saved to database!")
+                if flush_pending_messages(st.session_state.conversation_id):
+                    st.success("✅ Current conversation is saved to database!")
             else:
                 st.info("No active conversation to save")
 
     with col_action3:
         if st.button("📊 Export Summary", key="export_summary"):
             if st.session_state.messages:
-                summary = f"""# Discussion Summary
+                summary_parts = [f"""# Discussion Summary
 
 **Session:** {st.session_state.session_id[:8]}...
 **Messages:** {len(st.session_state.messages)}
@@ -2272,13 +2261,15 @@ with col2:
 **Files Generated:** {len(st.session_state.generated_files) if st.session_state.generated_files else 0}
 
 ## Messages:
-"""
-                for i, msg in enumerate(st.session_state.messages, 1):
-                    summary += f"\n### Message {i}\n**{msg['role'].title()}:** {msg['content'][:200]}{'...' if len(msg['content']) > 200 else ''}\n"
+"""]
+                summary_parts.extend(
+                    f"\n### Message {i}\n**{msg['role'].title()}:** {msg['content'][:200]}{'...' if len(msg['content']) > 200 else ''}\n"
+                    for i, msg in enumerate(st.session_state.messages, 1)
+                )
 
                 st.download_button(
                     label="📥 Download Summary",
-                    data=summary,
+                    data="".join(summary_parts),
                     file_name=f"discussion_summary_{st.session_state.session_id[:8]}.md",
                     mime="text/markdown",
                     key="download_summary"
@@ -7,17 +7,21 @@ Run this after creating your GitHub repository.
 import subprocess
 import sys
 
-def run_command(command, description=""):
-    """Run a shell command and return success status"""
+def run_command(cmd, description=""):
+    """Run a command given as an argv list and return success status"""
     print(f"🔧 {description}")
     try:
-        result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
+        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
         print(f"✅ {description} - Success")
         return True, result.stdout
     except subprocess.CalledProcessError as e:
         print(f"❌ {description} - Failed")
         print(f"Error: {e.stderr}")
         return False, e.stderr
+    except OSError as e:
+        print(f"❌ {description} - Failed")
+        print(f"Error: {e}")
+        return False, str(e)
 
 def main():
     """Main push function"""
@@ -35,20 +39,20 @@ def main():
     print(f"\n📦 Pushing to: {repo_url}")
 
     # Check if remote already exists
-    success, remotes = run_command("git remote -v", "Checking existing remotes")
+    success, remotes = run_command(["git", "remote", "-v"], "Checking existing remotes")
 
     if "origin" in remotes:
         print("⚠️  Remote 'origin' already exists. Removing it first...")
-        run_command("git remote remove origin", "Removing existing origin")
+        run_command(["git", "remote", "remove", "origin"], "Removing existing origin")
 
     # Add remote
-    success, _ = run_command(f"git remote add origin {repo_url}", "Adding GitHub remote")
+    success, _ = run_command(["git", "remote", "add", "origin", repo_url], "Adding GitHub remote")
     if not success:
         print("❌ Failed to add remote. Please check your username and try again.")
         sys.exit(1)
 
     # Push code
-    success, _ = run_command("git push -u origin master", "Pushing code to GitHub")
+    success, _ = run_command(["git", "push", "-u", "origin", "master"], "Pushing code to GitHub")
     if success:
         print("\n" + "="*50)
         print("🎉 SUCCESS! Your AI Discussion Manager is now live on GitHub!")
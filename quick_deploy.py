@@ -3,21 +3,40 @@
 Quick Deploy Script for AI Discussion Manager
 """
 
+import argparse
+import re
 import subprocess
 import sys
 
-def main():
-    print("🚀 Quick GitHub Deployment")
-    print("=" * 40)
+def parse_args(argv=None):
+    """Parse command line options so the script can run without prompts"""
+    parser = argparse.ArgumentParser(description="Push the AI Discussion Manager to GitHub")
+    parser.add_argument('--username', help="GitHub username that owns ai-discussion-manager")
+    parser.add_argument('--yes', action='store_true', help="Skip the 'does this repository exist' prompt")
+    return parser.parse_args(argv)
 
-    # Ask for correct GitHub username
-    print("\n📝 Please enter your CORRECT GitHub username:")
-    print("   (Check: https://github.com/settings/profile)")
-    print("   It should be just letters, numbers, and hyphens, no @ symbols")
+def main(argv=None):
+    args = parse_args(argv)
+    interactive = sys.stdin.isatty()
 
-    username = input("\nYour GitHub username: ").strip()
+    print("🚀 Quick GitHub Deployment")
+    print("=" * 40)
 
-    if not username or '@' in username:
+    if args.username is not None:
+        username = args.username.strip()
+    elif interactive:
+        # Ask for correct GitHub username
+        print("\n📝 Please enter your CORRECT GitHub username:")
+        print("   (Check: https://github.com/settings/profile)")
+        print("   It should be just letters, numbers, and hyphens, no @ symbols")
+
+        username = input("\nYour GitHub username: ").strip()
+    else:
+        print("❌ No terminal to prompt on. Pass --username (and --yes) to run non-interactively.")
+        sys.exit(2)
+
+    # GitHub usernames: up to 39 letters, digits and hyphens
+    if not re.fullmatch(r'[A-Za-z0-9-]{1,39}', username):
         print("❌ Invalid username. Please enter a valid GitHub username without @ symbols.")
         return
 
@@ -26,7 +45,13 @@ def main():
     print(f"   https://github.com/{username}/ai-discussion-manager")
     print("\n⚠️  Make sure this repository exists on GitHub!")
 
-    confirm = input("\nDoes this repository exist? (y/n): ").strip().lower()
+    if args.yes:
+        confirm = 'y'
+    elif interactive:
+        confirm = input("\nDoes this repository exist? (y/n): ").strip().lower()
+    else:
+        print("❌ No terminal to confirm on. Pass --yes once the repository exists.")
+        sys.exit(2)
 
     if confirm != 'y':
         print("\n❌ Please create the repository first, then run this script again.")
@@ -39,13 +64,13 @@ def main():
 
     try:
         # Remove existing remote if any
-        subprocess.run("git remote remove origin", shell=True, capture_output=True)
+        subprocess.run(["git", "remote", "remove", "origin"], capture_output=True)
 
         # Add new remote
-        subprocess.run(f"git remote add origin {repo_url}", shell=True, check=True)
+        subprocess.run(["git", "remote", "add", "origin", repo_url], check=True)
 
         # Push
-        result = subprocess.run("git push -u origin master", shell=True, check=True, capture_output=True, text=True)
+        result = subprocess.run(["git", "push", "-u", "origin", "master"], check=True, capture_output=True, text=True)
 
         print("\n" + "="*50)
         print("🎉 SUCCESS! DEPLOYMENT COMPLETE!")
@@ -53,8 +78,8 @@ def main():
         print(f"🌐 Live at: https://github.com/{username}/ai-discussion-manager")
         print(f"📖 README: https://github.com/{username}/ai-discussion-manager/blob/master/README.md")
 
-    except subprocess.CalledProcessError as e:
-        print(f"\n❌ Deployment failed: {e.stderr}")
+    except (subprocess.CalledProcessError, OSError) as e:
+        print(f"\n❌ Deployment failed: {getattr(e, 'stderr', None) or e}")
         print("\n🔧 Troubleshooting:")
         print("1. Make sure the repository exists")
         print("2. Check your GitHub username")
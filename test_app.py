@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+"""
+Smoke test: load the AI Discussion Manager page with Streamlit's AppTest
+"""
+
+from streamlit.testing.v1 import AppTest
+
+def test_app_loads():
+    """The default first load renders without raising"""
+    at = AppTest.from_file("main.py", default_timeout=30)
+    at.run()
+    assert not at.exception, [e.value for e in at.exception]
+
+if __name__ == "__main__":
+    test_app_loads()
+    print("✅ main.py loads without errors")
@@ -1,7 +1,11 @@
+import atexit
+import functools
 import openai
 import anthropic
 import httpx
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 class NoProxyHttpClient(httpx.Client):
     def __init__(self, **kwargs):
@@ -14,96 +18,114 @@ class NoProxyHttpClient(httpx.Client):
             del kwargs['proxies']
         super().__init__(**kwargs)
 
-def test_openai_connection(api_key):
+@functools.lru_cache(maxsize=1)
+def get_http_client():
+    """One pooled HTTP client shared by every connection test, closed at exit"""
+    client = NoProxyHttpClient()
+    atexit.register(client.close)
+    return client
+
+def test_openai_connection(api_key, out=print):
     try:
         client = openai.OpenAI(
             api_key=api_key,
-            http_client=NoProxyHttpClient(),
+            http_client=get_http_client(),
             max_retries=3
         )
-        print("Testing OpenAI connection...")
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role": "user", "content": "Say 'test successful'"}],
-            max_tokens=5
-        )
-        print(f"✅ OpenAI connection successful! Response: {response.choices[0].message.content}")
+        out("Testing OpenAI connection...")
+        # Listing models checks the key without paying for a completion
+        models = client.models.list()
+        out(f"✅ OpenAI connection successful! {len(models.data)} models available")
         return True
     except Exception as e:
-        print(f"❌ OpenAI connection failed: {str(e)}")
+        out(f"❌ OpenAI connection failed: {str(e)}")
         return False
 
-def test_claude_connection(api_key):
-    print("\n=== Testing Claude Connection ===")
+# Full tracebacks only when asked for, as in the .env template's DEBUG_MODE
+_DEBUG = os.getenv('DEBUG_MODE', 'false').lower() == 'true'
+
+# Fail fast on connect, allow a slower read; the SDK's own exponential
+# backoff with jitter handles transient failures across retries
+CLAUDE_TIMEOUT = httpx.Timeout(20.0, connect=5.0)
+CLAUDE_MAX_RETRIES = 4
+
+def _claude_error_hint(e):
+    """Explain an Anthropic SDK error by its type rather than its message"""
+    # APITimeoutError subclasses APIConnectionError, so check it first
+    if isinstance(e, anthropic.APITimeoutError):
+        return "The request timed out. This could be due to network issues or server slowness."
+    if isinstance(e, anthropic.APIConnectionError):
+        return "Connection error. Please check your internet connection and proxy settings."
+    if isinstance(e, anthropic.APIStatusError):
+        if e.status_code == 401:
+            return "Authentication failed. Please check your API key."
+        if e.status_code == 404:
+            return "The requested resource was not found. Check if the API endpoint is correct."
+    return None
+
+def test_claude_connection(api_key, out=print):
+    out("\n=== Testing Claude Connection ===")
     
     # Test 1: Basic API key validation
     if not api_key or not api_key.startswith('sk-ant-'):
-        print("❌ Invalid Claude API key format. It should start with 'sk-ant-'")
+        out("❌ Invalid Claude API key format. It should start with 'sk-ant-'")
         return False
     
-    # Test 2: Test connection with different configurations
-    configs = [
-        {"name": "Default config", "timeout": 30.0, "max_retries": 3},
-        {"name": "No timeout", "timeout": None, "max_retries": 1},
-        {"name": "Short timeout", "timeout": 10.0, "max_retries": 2}
-    ]
-    
-    for config in configs:
-        try:
-            print(f"\nTesting with {config['name']}...")
-            client = anthropic.Anthropic(
-                api_key=api_key,
-                timeout=config['timeout'],
-                max_retries=config['max_retries']
-            )
-            
-            # Simple test request
-            response = client.messages.create(
-                model="claude-3-haiku-20240307",
-                max_tokens=5,
-                messages=[{"role": "user", "content": "Say 'test successful'"}]
-            )
-            
-            # Check response structure
-            if not response.content or not hasattr(response.content[0], 'text'):
-                print(f"⚠️ Unexpected response format: {response}")
-                continue
-                
-            print(f"✅ Success with {config['name']}! Response: {response.content[0].text}")
-            return True
-            
-        except Exception as e:
+    # Test 2: Test connection, letting the client retry with backoff
+    try:
+        client = anthropic.Anthropic(
+            api_key=api_key,
+            timeout=CLAUDE_TIMEOUT,
+            max_retries=CLAUDE_MAX_RETRIES,
+            http_client=get_http_client()
+        )
+
+        # Simple test request
+        response = client.messages.create(
+            model="claude-3-haiku-20240307",
+            max_tokens=5,
+            messages=[{"role": "user", "content": "Say 'test successful'"}]
+        )
+
+        # Check response structure
+        if not response.content or not hasattr(response.content[0], 'text'):
+            out(f"⚠️ Unexpected response format: {response}")
+            return False
+
+        out(f"✅ Claude connection successful! Response: {response.content[0].text}")
+        return True
+
+    except Exception as e:
+        out("❌ Claude connection failed:")
+        out(f"   Error: {str(e)}")
+        out(f"   Type: {type(e).__name__}")
+
+        hint = _claude_error_hint(e)
+        if hint:
+            out(f"   ↳ {hint}")
+
+        if _DEBUG:
             import traceback
-            print(f"❌ Failed with {config['name']}:")
-            print(f"   Error: {str(e)}")
-            print(f"   Type: {type(e).__name__}")
-            
-            # Check for specific error types
-            if "timeout" in str(e).lower():
-                print("   ↳ The request timed out. This could be due to network issues or server slowness.")
-            elif "connect" in str(e).lower():
-                print("   ↳ Connection error. Please check your internet connection and proxy settings.")
-            elif "401" in str(e):
-                print("   ↳ Authentication failed. Please check your API key.")
-            elif "404" in str(e):
-                print("   ↳ The requested resource was not found. Check if the API endpoint is correct.")
-            
-            # Print full traceback for debugging
-            print("\nFull traceback for debugging:")
-            print("-" * 50)
-            print(traceback.format_exc())
-            print("-" * 50)
+            out("\nFull traceback for debugging:")
+            out("-" * 50)
+            out(traceback.format_exc())
+            out("-" * 50)
     
-    # If we get here, all configurations failed
-    print("\n❌ All connection attempts failed. Here are some things to try:")
-    print("1. Check your internet connection")
-    print("2. Verify your API key is correct")
-    print("3. Try using a different network (e.g., mobile hotspot)")
-    print("4. Check if your organization has any network restrictions")
-    print("5. Try again later in case of temporary service issues")
+    # If we get here, every retry failed
+    out("\n❌ All connection attempts failed. Here are some things to try:")
+    out("1. Check your internet connection")
+    out("2. Verify your API key is correct")
+    out("3. Try using a different network (e.g., mobile hotspot)")
+    out("4. Check if your organization has any network restrictions")
+    out("5. Try again later in case of temporary service issues")
     
     return False
 
+def run_buffered(test, api_key):
+    """Run a connection test, collecting its report instead of printing it"""
+    lines = []
+    return test(api_key, out=lines.append), lines
+
 if __name__ == "__main__":
     if len(sys.argv) != 3:
         print("Usage: python test_connection.py <openai_api_key> <claude_api_key>")
@@ -113,7 +135,11 @@ if __name__ == "__main__":
     openai_key = sys.argv[1] if sys.argv[1].lower() != 'none' else None
     claude_key = sys.argv[2] if sys.argv[2].lower() != 'none' else None
     
-    if openai_key:
-        test_openai_connection(openai_key)
-    if claude_key:
-        test_claude_connection(claude_key)
+    # The two providers are independent, so test them at the same time; each
+    # report is buffered and printed whole so the two never interleave
+    tests = [(test, key) for test, key in ((test_openai_connection, openai_key), (test_claude_connection, claude_key)) if key]
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(run_buffered, test, key) for test, key in tests]
+        for future in as_completed(futures):
+            _, lines = future.result()
+            print("\n".join(lines))
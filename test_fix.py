@@ -6,6 +6,8 @@ Test script to verify the KeyError fix for AI Discussion Manager
 import sys
 import os
 
+from prompts import DISCUSSION_STYLE_SUFFIX, TEAM_PROMPTS_FILE, TEAM_PROMPTS_NOFILE, build_team_prompt
+
 def test_system_prompts():
     """Test the system prompts logic that was causing the KeyError"""
 
@@ -14,45 +16,32 @@ def test_system_prompts():
     discussion_style = "Creative Brainstorm"
     is_file_content = False
 
-    # Test the team_base_prompts dictionary
-    team_base_prompts = {
-        "Frontend Dev": f"""You are {next_team}, a frontend development expert specializing in modern web technologies.
-
-{f'Analyze the uploaded documentation and provide frontend-specific insights. Consider UI/UX best practices, responsive design, performance optimization, and integration with backend APIs.' if is_file_content else 'Provide frontend development expertise for the described project.'}
-
-Focus on user experience, accessibility, and modern frontend frameworks like React, Vue, or Angular.""",
-
-        "Backend Dev": f"""You are {next_team}, a backend development expert specializing in server-side technologies.
-
-{f'Analyze the uploaded documentation and provide backend architecture insights. Consider API design, database integration, security, scalability, and microservices architecture.' if is_file_content else 'Provide backend development expertise for the described project.'}
-
-Focus on robust, scalable, and maintainable server-side solutions.""",
-
-        "Project Manager": f"""You are {next_team}, a project management and coordination specialist overseeing the entire development process.
-
-{f'Analyze the uploaded documentation and provide project management insights. Coordinate between different teams, manage timelines, identify dependencies, and ensure project success.' if is_file_content else 'Provide project management expertise for the described project.'}
-
-Focus on project planning, team coordination, risk management, and delivery milestones."""
-    }
-
     print("🧪 Testing system prompts logic...")
 
-    # Test getting the base team prompt
-    system_prompt = team_base_prompts.get(next_team, f"You are {next_team}, an expert in your field. Provide valuable insights for this project.")
+    # Test the prompt main.py sends for the team and discussion style
+    system_prompt = build_team_prompt(next_team, discussion_style, is_file_content)
 
+    if not system_prompt.startswith(TEAM_PROMPTS_NOFILE[next_team]):
+        print(f"❌ Base prompt missing for team: {next_team}")
+        return False
     print(f"✅ Base prompt retrieved for team: {next_team}")
 
-    # Test adding discussion style context
-    if discussion_style == "Collaborative":
-        system_prompt += "\n\nApproach this collaboratively, building on previous suggestions and finding common ground between different perspectives."
-    elif discussion_style == "Debate":
-        system_prompt += "\n\nApproach this as a constructive debate, presenting well-reasoned arguments and considering alternative viewpoints."
-    elif discussion_style == "Technical Review":
-        system_prompt += "\n\nConduct a thorough technical review, focusing on best practices, potential issues, and optimization opportunities."
-    elif discussion_style == "Creative Brainstorm":
-        system_prompt += "\n\nBrainstorm creative and innovative solutions, thinking outside the box while maintaining technical feasibility."
-
+    if not system_prompt.endswith(DISCUSSION_STYLE_SUFFIX[discussion_style]):
+        print(f"❌ Discussion style '{discussion_style}' context missing")
+        return False
     print(f"✅ Discussion style '{discussion_style}' context added")
+
+    # Every team has a prompt with and without an uploaded document
+    if TEAM_PROMPTS_FILE.keys() != TEAM_PROMPTS_NOFILE.keys():
+        print("❌ File and no-file prompts cover different teams")
+        return False
+
+    # Unknown teams and styles fall back instead of raising KeyError
+    if not build_team_prompt("Unknown Team", "Unknown Style", True).startswith("You are Unknown Team"):
+        print("❌ Unknown team did not get the fallback prompt")
+        return False
+    print("✅ Unknown team and style fall back without KeyError")
+
     print(f"✅ Final prompt length: {len(system_prompt)} characters")
 
     return True
@@ -6,6 +6,7 @@ Test script to verify the updated AI Discussion Manager features
 import os
 import sys
 from dotenv import load_dotenv
+from env_bootstrap import ensure_env_template
 
 # Load environment variables from .env file
 load_dotenv()
@@ -14,38 +15,14 @@ def test_environment_variables():
     """Test that environment variables are properly configured"""
     print("🧪 Testing Environment Variables...")
 
-    # Check if .env file exists
-    env_file_exists = os.path.exists('.env')
-
-    if not env_file_exists:
-        print("⚠️  No .env file found")
-        print("   Creating template .env file...")
-
-        env_template = """# AI Discussion Manager Configuration
-# Replace with your actual values
-
-# Database Configuration
-DB_HOST=localhost
-DB_USER=root
-DB_PASSWORD=your_mysql_password
-DB_NAME=ai_discussion_manager
-DB_PORT=3306
-
-# OpenAI Configuration
-OPENAI_API_KEY=sk-your_openai_api_key_here
-
-# Optional Settings
-MAX_WORD_LIMIT=150
-DEFAULT_DISCUSSION_ROUNDS=5
-DEBUG_MODE=false"""
-
-        try:
-            with open('.env', 'w') as f:
-                f.write(env_template)
-            print("✅ Created .env template file")
+    # Create a .env template if there is none yet
+    try:
+        if ensure_env_template('full'):
+            print("⚠️  No .env file found")
+            print("✅ Created template .env file")
             print("📝 Please edit .env file with your actual values")
-        except Exception as e:
-            print(f"❌ Could not create .env file: {e}")
+    except Exception as e:
+        print(f"❌ Could not create .env file: {e}")
 
     # For testing purposes, set a dummy API key if not set
     if not os.getenv('OPENAI_API_KEY'):
@@ -122,7 +99,7 @@ def test_file_types():
     """Test supported file types"""
     print("\n🧪 Testing File Type Support...")
 
-    supported_extensions = ['.md', '.txt']
+    supported_extensions = ('.md', '.txt')
     test_files = [
         'project.md',
         'requirements.txt',
@@ -131,7 +108,7 @@ def test_file_types():
     ]
 
     for filename in test_files:
-        is_supported = any(filename.lower().endswith(ext) for ext in supported_extensions)
+        is_supported = filename.lower().endswith(supported_extensions)
         expected = filename in ['project.md', 'requirements.txt']
 
         if is_supported == expected: